@@ -0,0 +1,175 @@
+"""Micro-benchmarks for the data path.
+
+    $ python benchmarks.py parse montecarlo pipeline combined
+"""
+import argparse
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+def best_of(func, repeat):
+    """Best wall time of several runs, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+def bench_parse(widths=(20, 100, 400), n_athletes=60, repeat=20):
+    """Compare default pd.read_csv ingest with the projected pyarrow parse on wide sheets"""
+    from loadtest import synthetic_round_frame
+    from pipeline import apply_round_schema, parse_round_csv
+    
+    def pandas_path(content, round_name):
+        df = pd.read_csv(io.BytesIO(content))
+        df.columns = df.columns.str.strip()
+        return apply_round_schema(df, round_name)
+    
+    def arrow_path(content, round_name):
+        df, _ = parse_round_csv(content, round_name)
+        return apply_round_schema(df, round_name)
+    
+    rows = []
+    for width in widths:
+        for round_name in ("Male Boulder Final", "Female Lead Semis"):
+            df = synthetic_round_frame(round_name, n_athletes, extra_columns=width)
+            content = df.to_csv(index=False).encode()
+            
+            # Both paths must agree on the mapped columns
+            expected = pandas_path(content, round_name)[0]
+            parsed = arrow_path(content, round_name)[0]
+            pd.testing.assert_frame_equal(expected[parsed.columns], parsed, check_categorical=False)
+            
+            pandas_ms = best_of(lambda: pandas_path(content, round_name), repeat)
+            arrow_ms = best_of(lambda: arrow_path(content, round_name), repeat)
+            rows.append({
+                'round': round_name,
+                'columns': len(df.columns),
+                'kb': round(len(content) / 1024, 1),
+                'pandas_ms': round(pandas_ms, 2),
+                'pyarrow_ms': round(arrow_ms, 2),
+                'speedup': f"{pandas_ms / arrow_ms:.1f}x"
+            })
+    
+    return pd.DataFrame(rows)
+
+def bench_montecarlo(simulations=(10_000, 100_000, 400_000), n_athletes=24, workers=(1, 4), repeat=3):
+    """Time qualification probabilities for a half-finished semi-final at growing simulation counts"""
+    import numpy as np
+    import simulation
+    
+    rng = np.random.default_rng(0)
+    results = rng.choice([0, 1, 10, 11], size=(n_athletes, 4)).astype(float)
+    results[n_athletes // 2:, 2:] = np.nan
+    heights = rng.integers(10, 45, n_athletes) + 0.5 * rng.integers(0, 2, n_athletes)
+    heights = np.where(np.arange(n_athletes) < n_athletes // 2, heights, np.nan)
+    
+    rows = []
+    for n_sims in simulations:
+        for n_workers in workers:
+            rows.append({
+                'simulations': n_sims,
+                'workers': n_workers,
+                'boulder_ms': round(best_of(lambda: simulation.boulder_probabilities(
+                    results, n_sims=n_sims, workers=n_workers), repeat), 1),
+                'lead_ms': round(best_of(lambda: simulation.lead_probabilities(
+                    heights, n_sims=n_sims, workers=n_workers), repeat), 1)
+            })
+    
+    return pd.DataFrame(rows)
+
+def bench_pipeline(n_athletes=60, repeat=5):
+    """Time interpreter startup and a full headless export of every round"""
+    from loadtest import synthetic_round_frame
+    from pipeline import SHEETS_URLS, export_rounds, run_pipeline
+    
+    def run_python(*args):
+        subprocess.run([sys.executable, *args], check=True, capture_output=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+    
+    rows = []
+    for module in ("pipeline", "streamlit_app"):
+        import_ms = best_of(lambda: run_python("-c", f"import {module}"), repeat)
+        rows.append({'stage': f"import {module}", 'ms': round(import_ms, 1)})
+    
+    with tempfile.TemporaryDirectory() as local_dir, tempfile.TemporaryDirectory() as out_dir:
+        for round_name in SHEETS_URLS:
+            synthetic_round_frame(round_name, n_athletes).to_csv(os.path.join(local_dir, f"{round_name}.csv"), index=False)
+        
+        def in_process(file_format):
+            store, _ = run_pipeline(local_dir)
+            export_rounds(store, out_dir, file_format)
+        
+        for file_format in ("parquet", "json"):
+            rows.append({'stage': f"run + export {file_format} (in process)",
+                         'ms': round(best_of(lambda: in_process(file_format), repeat), 1)})
+            rows.append({'stage': f"pipeline.py CLI {file_format} (end to end)",
+                         'ms': round(best_of(lambda: run_python("pipeline.py", out_dir, "--local-dir", local_dir,
+                                                                "--format", file_format), repeat), 1)})
+    
+    return pd.DataFrame(rows)
+
+def bench_combined(events=(1, 10, 40), n_athletes=60, repeat=5):
+    """Compare a full combined-standings rebuild with an update after one round changes"""
+    from loadtest import synthetic_round_frame
+    from pipeline import SHEETS_URLS, CombinedStandings, apply_round_schema
+    
+    round_frames = {
+        round_name: apply_round_schema(synthetic_round_frame(round_name, n_athletes), round_name)[0]
+        for round_name in SHEETS_URLS
+    }
+    
+    rows = []
+    for n_events in events:
+        # A season registry: every event repeats the eight rounds under its own prefix
+        all_data = {f"Event {event} {round_name}": df
+                    for event in range(n_events) for round_name, df in round_frames.items()}
+        data_version = tuple((round_name, 0) for round_name in all_data)
+        changed_round = next(iter(all_data))
+        changed_version = tuple((round_name, int(round_name == changed_round)) for round_name in all_data)
+        
+        def incremental():
+            standings = CombinedStandings()
+            standings.update(all_data, data_version)
+            started = time.perf_counter()
+            standings.update(all_data, changed_version)
+            return (time.perf_counter() - started) * 1000
+        
+        rows.append({
+            'events': n_events,
+            'rounds': len(all_data),
+            'full_ms': round(best_of(lambda: CombinedStandings().update(all_data, data_version), repeat), 2),
+            'one_round_changed_ms': round(min(incremental() for _ in range(repeat)), 2)
+        })
+    
+    return pd.DataFrame(rows)
+
+BENCHMARKS = {
+    'parse': bench_parse,
+    'montecarlo': bench_montecarlo,
+    'pipeline': bench_pipeline,
+    'combined': bench_combined,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("benchmarks", nargs="*", help=f"any of {', '.join(BENCHMARKS)} (default: all)")
+    args = parser.parse_args()
+    
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    
+    for name in args.benchmarks or BENCHMARKS:
+        print(f"## {name}")
+        print(BENCHMARKS[name]().to_string(index=False))
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Plotly charts shared by the app and the batch exports, free of Streamlit."""
+import pandas as pd
+import plotly.graph_objects as go
+
+from pipeline import find_athlete
+
+# Define round order
+ROUND_ORDER = [
+    "Male Boulder Semis", "Male Boulder Final",
+    "Female Boulder Semis", "Female Boulder Final",
+    "Male Lead Semis", "Male Lead Final",
+    "Female Lead Semis", "Female Lead Final"
+]
+
+def progression_figure(athlete_name, ranks):
+    """Plot an athlete's rank per round, or None with fewer than two ranked rounds"""
+    prog_df = ranks.reindex(ROUND_ORDER).dropna()
+    
+    if len(prog_df) > 1:
+        prog_df = pd.DataFrame({
+            'Round': prog_df.index.str.replace("Male ", "").str.replace("Female ", ""),
+            'Rank': prog_df.to_numpy(dtype=int),
+            'Full_Round': prog_df.index
+        })
+        
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=prog_df['Round'],
+            y=prog_df['Rank'],
+            mode='lines+markers',
+            name=athlete_name,
+            line=dict(width=4, color='#3498db'),
+            marker=dict(size=12, color='#e74c3c', line=dict(width=2, color='white'))
+        ))
+        
+        fig.update_layout(
+            title=f"🏆 {athlete_name}'s Competition Progression",
+            yaxis=dict(autorange='reversed', title="Rank"),
+            xaxis=dict(title="Round"),
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+        )
+        
+        return fig
+    
+    return None
+
+def create_athlete_progression_chart(results_table, athlete_index, athlete_name):
+    """Create a chart showing athlete's progression through competition"""
+    long_df = results_table['long']
+    athlete_results = long_df[long_df['athlete_id'] == find_athlete(athlete_index, athlete_name)]
+    ranks = athlete_results.set_index(athlete_results['Round'].astype(str))['Rank']
+    return progression_figure(athlete_name, ranks)
@@ -0,0 +1,191 @@
+"""Batch export of athlete profile sheets for the media team.
+
+    $ python export_profiles.py profiles/
+    $ python export_profiles.py profiles/ --formats html png pdf --workers 8
+
+Renders every athlete's round-by-round summary under their progression chart,
+spreading athletes over a process pool. Each athlete's displayed rows are
+fingerprinted, and athletes whose fingerprint matches the last export are
+skipped. PNG and PDF output needs the optional kaleido package.
+"""
+import argparse
+import hashlib
+import html
+import importlib.util
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
+from plotly.subplots import make_subplots
+
+from charts import progression_figure
+from pipeline import run_pipeline
+from static_site import render_page, round_leaderboard
+
+PROFILE_INDEX = "index.json"
+PLOTLY_JS = "plotly.min.js"
+IMAGE_FORMATS = ("png", "pdf")
+
+def collect_profiles(all_data):
+    """Group every round's leaderboard rows by athlete"""
+    profiles = {}
+    for round_name, df in all_data.items():
+        for row in round_leaderboard(round_name, df):
+            profile = profiles.setdefault(row['slug'], {'name': row['name'], 'rounds': []})
+            profile['rounds'].append({
+                'round': round_name,
+                **{key: value for key, value in row.items() if key not in ('name', 'slug')}
+            })
+    return profiles
+
+def fingerprint(profile):
+    """Hash everything a profile sheet shows, so unchanged athletes can be skipped"""
+    return hashlib.sha1(json.dumps(profile, sort_keys=True).encode()).hexdigest()
+
+def describe_round(entry):
+    """Summarize a round's boulders or target holds in one line"""
+    if 'boulders' in entry:
+        return " ".join(f"B{i}: {boulder['result']}" for i, boulder in enumerate(entry['boulders'], 1))
+    return ", ".join(f"{key.replace('_', ' ')}: {value}"
+                     for key, value in entry.get('target_holds', {}).items() if value != "N/A")
+
+def profile_figure(profile):
+    """Lay out an athlete's progression chart above their round-by-round summary"""
+    ranks = pd.Series({entry['round']: pd.to_numeric(entry['rank'], errors='coerce')
+                       for entry in profile['rounds']}, dtype=float)
+    chart = progression_figure(profile['name'], ranks)
+    
+    specs = ([[{'type': 'xy'}]] if chart else []) + [[{'type': 'table'}]]
+    fig = make_subplots(rows=len(specs), cols=1, specs=specs, vertical_spacing=0.08,
+                        row_heights=[0.55, 0.45] if chart else None)
+    if chart:
+        fig.add_traces(chart.data, rows=1, cols=1)
+        fig.update_yaxes(autorange='reversed', title_text="Rank", row=1, col=1)
+        fig.update_xaxes(title_text="Round", row=1, col=1)
+    
+    columns = {
+        'Round': [entry['round'] for entry in profile['rounds']],
+        'Rank': [entry['rank'] for entry in profile['rounds']],
+        'Score': [entry['score'] for entry in profile['rounds']],
+        'Worst Case': [entry['worst_case'] for entry in profile['rounds']],
+        'Details': [describe_round(entry) for entry in profile['rounds']]
+    }
+    fig.add_trace(go.Table(
+        columnwidth=[3, 1, 1, 1, 5],
+        header=dict(values=list(columns), fill_color='#2c3e50', font=dict(color='white'), align='left'),
+        cells=dict(values=list(columns.values()), fill_color='#ecf0f1', align='left')
+    ), row=len(specs), col=1)
+    
+    fig.update_layout(
+        title=f"🎯 Complete Profile: {profile['name']}",
+        showlegend=False,
+        width=900,
+        height=700 if chart else 400,
+        plot_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+def render_profile(slug, profile, directory, formats):
+    """Write one athlete's profile sheet in every requested format"""
+    fig = profile_figure(profile)
+    files = []
+    for file_format in formats:
+        path = os.path.join(directory, f"{slug}.{file_format}")
+        if file_format == "html":
+            # Every sheet shares one copy of plotly.js next to it
+            body = fig.to_html(full_html=False, include_plotlyjs=PLOTLY_JS)
+            with open(path, "w", encoding="utf-8") as html_file:
+                html_file.write(render_page(profile['name'], body, depth=1))
+        else:
+            fig.write_image(path, format=file_format)
+        files.append(os.path.basename(path))
+    return slug, files
+
+def load_profile_index(directory):
+    try:
+        with open(os.path.join(directory, PROFILE_INDEX)) as index_file:
+            return json.load(index_file)
+    except FileNotFoundError:
+        return {}
+
+def write_profile_index(directory, profile_index):
+    """Record fingerprints for the next run and list the sheets in an index page"""
+    with open(os.path.join(directory, PROFILE_INDEX), "w") as index_file:
+        json.dump(profile_index, index_file, indent=2, ensure_ascii=False)
+    
+    items = [
+        f'<li>{html.escape(entry["name"])}: '
+        + " ".join(f'<a href="profiles/{file_name}">{file_name.rsplit(".", 1)[1].upper()}</a>'
+                   for file_name in entry['files'])
+        + "</li>"
+        for entry in sorted(profile_index.values(), key=lambda entry: entry['name'])
+    ]
+    with open(os.path.join(directory, "index.html"), "w", encoding="utf-8") as html_file:
+        html_file.write(render_page("Athlete Profiles", f"<ul>\n{chr(10).join(items)}\n</ul>"))
+
+def export_profiles(directory, all_data, formats=("html",), workers=None, force=False):
+    """Render the profiles whose content changed, returning (rendered, skipped) counts"""
+    profiles_dir = os.path.join(directory, "profiles")
+    os.makedirs(profiles_dir, exist_ok=True)
+    if "html" in formats and not os.path.exists(os.path.join(profiles_dir, PLOTLY_JS)):
+        with open(os.path.join(profiles_dir, PLOTLY_JS), "w", encoding="utf-8") as js_file:
+            js_file.write(get_plotlyjs())
+    
+    previous_index = load_profile_index(directory)
+    profiles = collect_profiles(all_data)
+    profile_index = {}
+    stale = []
+    
+    for slug, profile in profiles.items():
+        entry = {
+            'name': profile['name'],
+            'fingerprint': fingerprint(profile),
+            'files': [f"{slug}.{file_format}" for file_format in formats]
+        }
+        profile_index[slug] = entry
+        previous = previous_index.get(slug, {})
+        up_to_date = (
+            previous.get('fingerprint') == entry['fingerprint']
+            and all(os.path.exists(os.path.join(profiles_dir, file_name)) for file_name in entry['files'])
+        )
+        if force or not up_to_date:
+            stale.append(slug)
+    
+    if stale:
+        with ProcessPoolExecutor(workers) as pool:
+            list(pool.map(render_profile, stale, [profiles[slug] for slug in stale],
+                          [profiles_dir] * len(stale), [formats] * len(stale), chunksize=8))
+    
+    write_profile_index(directory, profile_index)
+    return len(stale), len(profiles) - len(stale)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="output directory for the profile sheets")
+    parser.add_argument("--formats", nargs="+", choices=("html",) + IMAGE_FORMATS, default=["html"])
+    parser.add_argument("--workers", type=int, help="processes to render with (default: one per core)")
+    parser.add_argument("--local-dir", help='read "<round name>.csv" files from this directory instead of the Sheets')
+    parser.add_argument("--force", action="store_true", help="re-render every profile, changed or not")
+    args = parser.parse_args()
+    
+    if set(args.formats) & set(IMAGE_FORMATS) and importlib.util.find_spec("kaleido") is None:
+        parser.error("PNG and PDF export need the kaleido package (pip install kaleido)")
+    
+    started = time.perf_counter()
+    store, errors = run_pipeline(args.local_dir)
+    frames, _ = store.snapshot()
+    rendered, skipped = export_profiles(args.directory, frames, tuple(args.formats), args.workers, args.force)
+    print(f"rendered {rendered} profiles, skipped {skipped} unchanged, "
+          f"in {time.perf_counter() - started:.2f}s")
+    
+    for round_name, error in errors.items():
+        print(f"error {round_name}: {error}")
+    if errors:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Standalone ingestion worker publishing round snapshots for app replicas.
+
+    $ python ingest_worker.py /srv/ifsc/snapshots
+    $ IFSC_SNAPSHOT_DIR=/srv/ifsc/snapshots streamlit run streamlit_app.py
+
+Polls every SHEETS_URLS round on the app's adaptive schedule and writes each
+new round version as an Arrow IPC file next to a manifest.json. Both are
+renamed into place, so replicas never see a partial file. With --site, the
+static leaderboard pages are re-rendered as well.
+"""
+import argparse
+import json
+import os
+from datetime import datetime
+
+import pyarrow as pa
+
+from static_site import StaticSite
+from pipeline import SNAPSHOT_MANIFEST, RoundStore, SheetsFetchClient, SheetsSource, slugify, write_atomically
+
+# Snapshot files kept per round; replicas that read the previous manifest may
+# still be opening the file it names
+SNAPSHOT_HISTORY = 2
+
+def write_round_snapshot(path, df):
+    """Write a round frame as an Arrow IPC file, keeping its pandas dtypes"""
+    table = pa.Table.from_pandas(df)
+    
+    def write(sink):
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    
+    write_atomically(path, write)
+
+class SnapshotStore(RoundStore):
+    """Round store that also publishes every new round version as a snapshot file"""
+    
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+        self.files = {}
+        os.makedirs(directory, exist_ok=True)
+    
+    def publish(self, round_name, df, stats=None):
+        if not super().publish(round_name, df, stats):
+            return False
+        
+        file_name = f"{slugify(round_name)}-{self.versions[round_name]:016x}.arrow"
+        write_round_snapshot(os.path.join(self.directory, file_name), df)
+        self.files.setdefault(round_name, []).append(file_name)
+        return True
+    
+    def write_manifest(self, errors):
+        """Point replicas at the latest snapshots, then drop files nobody can still reach"""
+        manifest = {
+            'written_at': datetime.now().isoformat(),
+            'rounds': {
+                round_name: {
+                    'file': self.files[round_name][-1],
+                    'version': version,
+                    'published_at': self.published_at[round_name].isoformat(),
+                    'stats': self.ingest_stats.get(round_name)
+                }
+                for round_name, version in self.versions.items()
+            },
+            'errors': errors
+        }
+        write_atomically(os.path.join(self.directory, SNAPSHOT_MANIFEST),
+                         lambda sink: sink.write(json.dumps(manifest, indent=2, default=str).encode()))
+        
+        # Also removes snapshots left behind by earlier worker runs
+        kept = {file_name for files in self.files.values() for file_name in files[-SNAPSHOT_HISTORY:]}
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(".arrow") and file_name not in kept:
+                os.unlink(os.path.join(self.directory, file_name))
+        for files in self.files.values():
+            del files[:-SNAPSHOT_HISTORY]
+
+def run(source, store, site=None, once=False):
+    """Poll due rounds and rewrite the manifest whenever data or errors change"""
+    errors = None
+    while True:
+        changed_rounds = source.poll()
+        if changed_rounds or source.errors != errors:
+            errors = dict(source.errors)
+            store.write_manifest(errors)
+            if site is not None and changed_rounds:
+                site.render(store, changed_rounds)
+            for round_name in changed_rounds:
+                print(f"{datetime.now():%H:%M:%S} published {round_name} -> {store.files[round_name][-1]}", flush=True)
+            for round_name, error in errors.items():
+                print(f"{datetime.now():%H:%M:%S} error {round_name}: {error}", flush=True)
+        
+        if once:
+            return
+        source.wake.wait(source.seconds_until_next_poll())
+        source.wake.clear()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="snapshot directory shared with the app replicas")
+    parser.add_argument("--site", help="also render static leaderboard pages into this directory")
+    parser.add_argument("--once", action="store_true", help="poll every round once, publish and exit")
+    args = parser.parse_args()
+    
+    store = SnapshotStore(args.directory)
+    site = StaticSite(args.site) if args.site else None
+    run(SheetsSource(store, SheetsFetchClient()), store, site, once=args.once)
+
+if __name__ == "__main__":
+    main()
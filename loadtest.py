@@ -0,0 +1,329 @@
+"""Concurrent-session load test for the Streamlit app.
+
+Serves synthetic round CSVs from a local stub in place of Google Sheets, starts
+a real ``streamlit run`` server against it, and drives N concurrent headless
+sessions through every view of ``main()`` over Streamlit's websocket protocol.
+Reports rerun latency percentiles plus server CPU and resident memory per
+session, and exits non-zero when a budget is exceeded so it can gate CI:
+
+    $ python loadtest.py --sessions 8 --reruns 3
+"""
+import argparse
+import asyncio
+import http.server
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+# Default CI budget
+DEFAULT_MAX_P95_MS = 3000
+DEFAULT_MAX_CPU_S_PER_SESSION = 20
+DEFAULT_MAX_RSS_MB_PER_SESSION = 40
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+VIEWS = ["Competition Overview", "Round Results", "Combined Standings", "Athlete Profile",
+         "Live Comparison", "Debug Mode"]
+FIRST_NAMES = ["Jongwon", "Tomoa", "Janja", "Ondřej", "Sorato", "Brooke", "Jakob", "Aleš", "Chaehyun", "Oriane"]
+LAST_NAMES = ["Chon", "Narasaki", "Garnbret", "Štěpán", "Anraku", "Raboutou", "Schubert", "Mayr", "Seo", "Bertone"]
+
+def synthetic_round_frame(round_name, n_athletes=24, extra_columns=0, seed=0):
+    """Build a plausible results sheet for a round using its column mapping"""
+    from pipeline import get_column_mapping
+    
+    rng = random.Random(f"{round_name}-{seed}")
+    cols_mapping = get_column_mapping(round_name)
+    names = [f"{first} {last.upper()} {i}" for i, (first, last) in enumerate(
+        (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)) for _ in range(n_athletes))]
+    ranks = list(range(1, n_athletes + 1))
+    
+    df = pd.DataFrame({cols_mapping['name']: names, cols_mapping['rank']: ranks})
+    df[cols_mapping['worst_case']] = [min(n_athletes, rank + rng.randint(0, 4)) for rank in ranks]
+    
+    if 'boulder_cols' in cols_mapping:
+        for col in cols_mapping['boulder_cols']:
+            df[col] = [rng.choice([0, 1, 10, 11, 11]) for _ in ranks]
+        df[cols_mapping['score']] = [round(100 - rank * 3.7, 1) for rank in ranks]
+    else:
+        df[cols_mapping['score']] = [f"{max(1, 45 - rank)}{rng.choice(['', '+'])}" for rank in ranks]
+    
+    if 'status' in cols_mapping:
+        qualified = "Podium" if "Final" in round_name else "Qualified"
+        df[cols_mapping['status']] = [qualified if rank <= 3 else "Eliminated" for rank in ranks]
+    
+    for key in ('qualification_hold', 'hold_for_1st', 'hold_for_2nd', 'hold_for_3rd'):
+        if key in cols_mapping:
+            df[cols_mapping[key]] = [f"{rng.randint(20, 45)}+" for _ in ranks]
+    
+    for key in ('strategy_cols', 'points_cols'):
+        for col in cols_mapping.get(key, []):
+            df[col] = [rng.choice(["T1 T2", "Z3", "-"]) for _ in ranks]
+    
+    # Helper columns the real sheets carry beyond the mapped ones
+    helpers = pd.DataFrame(
+        np.round(np.random.default_rng(seed).random((n_athletes, extra_columns)) * 100, 2),
+        columns=[f"Helper {i}" for i in range(extra_columns)]
+    )
+    return pd.concat([df, helpers], axis=1)
+
+def start_stub_server(round_names, n_athletes):
+    """Serve one synthetic CSV per round from a local HTTP server"""
+    payloads = {
+        f"/round/{i}.csv": synthetic_round_frame(round_name, n_athletes).to_csv(index=False).encode()
+        for i, round_name in enumerate(round_names)
+    }
+    
+    class StubHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = payloads.get(self.path)
+            if body is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/csv")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    urls = {round_name: f"{base_url}/round/{i}.csv" for i, round_name in enumerate(round_names)}
+    return server, urls
+
+def get_process_usage(pid):
+    """CPU seconds and resident bytes of a process, read from /proc"""
+    with open(f"/proc/{pid}/stat") as stat_file:
+        # Fields after the parenthesised command name; utime and stime are 14 and 15
+        fields = stat_file.read().rsplit(")", 1)[1].split()
+    cpu_s = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    
+    with open(f"/proc/{pid}/statm") as statm_file:
+        rss_bytes = int(statm_file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    
+    return cpu_s, rss_bytes
+
+def start_app_server(urls, timeout):
+    """Run the app under ``streamlit run`` on a free port and wait until healthy"""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    
+    env = dict(os.environ, IFSC_SHEETS_URLS=json.dumps(urls))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH,
+         "--server.headless", "true",
+         "--server.address", "127.0.0.1",
+         "--server.port", str(port),
+         "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "false"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return process, port
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError("streamlit exited before becoming healthy")
+            time.sleep(0.2)
+    
+    process.kill()
+    raise TimeoutError("streamlit did not become healthy in time")
+
+class HeadlessSession:
+    """Minimal browser stand-in that speaks Streamlit's websocket protocol"""
+    
+    def __init__(self, port, timeout):
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.timeout = timeout
+        self.websocket = None
+        self.widgets = {}
+        self.widget_states = {}
+        self.message_cache = {}
+        self.errors = []
+    
+    async def connect(self):
+        from tornado.websocket import websocket_connect
+        self.websocket = await websocket_connect(self.url, subprotocols=["streamlit"])
+    
+    def close(self):
+        self.websocket.close()
+    
+    async def rerun(self):
+        """Request a rerun with the current widget values and wait for it to finish"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        
+        back_msg = BackMsg()
+        back_msg.rerun_script.query_string = ""
+        back_msg.rerun_script.widget_states.widgets.extend(self.widget_states.values())
+        await self.websocket.write_message(back_msg.SerializeToString(), binary=True)
+        
+        self.widgets = {}
+        while True:
+            payload = await asyncio.wait_for(self.websocket.read_message(), self.timeout)
+            if payload is None:
+                raise ConnectionError("server closed the websocket")
+            
+            msg = ForwardMsg()
+            msg.ParseFromString(payload)
+            # Large messages are sent once and referenced by hash afterwards
+            if msg.WhichOneof("type") == "ref_hash":
+                msg = self.message_cache[msg.ref_hash]
+            elif msg.hash:
+                self.message_cache[msg.hash] = msg
+            
+            kind = msg.WhichOneof("type")
+            if kind == "script_finished":
+                return
+            if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type in ("selectbox", "multiselect"):
+                    widget = getattr(element, element_type)
+                    self.widgets[widget.label] = widget
+                elif element_type == "exception":
+                    self.errors.append(element.exception.message)
+    
+    def select(self, label, value):
+        """Set a selectbox (one option) or multiselect (list of options) by label"""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        
+        widget = self.widgets[label]
+        options = list(widget.options)
+        state = WidgetState(id=widget.id)
+        if isinstance(value, list):
+            state.int_array_value.data.extend(options.index(option) for option in value)
+        else:
+            state.int_value = options.index(value)
+        self.widget_states[widget.id] = state
+
+async def run_session(session_id, port, reruns, round_names, timeout):
+    """Drive one simulated viewer through every view, timing each rerun"""
+    rng = random.Random(session_id)
+    session = HeadlessSession(port, timeout)
+    await session.connect()
+    latencies = []
+    
+    async def timed_rerun():
+        started = time.perf_counter()
+        await session.rerun()
+        latencies.append((time.perf_counter() - started) * 1000)
+    
+    try:
+        await timed_rerun()
+        for _ in range(reruns):
+            for view in VIEWS:
+                session.select("Choose view:", view)
+                await timed_rerun()
+                
+                if view in ("Round Results", "Debug Mode"):
+                    label = "Select Round:" if view == "Round Results" else "Select Round for Debug:"
+                    session.select(label, rng.choice(round_names))
+                elif view == "Combined Standings":
+                    session.select("Select standings:", rng.choice(list(session.widgets["Select standings:"].options)))
+                elif view == "Athlete Profile":
+                    options = list(session.widgets["Select athlete:"].options)
+                    session.select("Select athlete:", rng.choice(options[1:]))
+                elif view == "Live Comparison":
+                    options = list(session.widgets["Select athletes to compare:"].options)
+                    session.select("Select athletes to compare:", rng.sample(options, min(3, len(options))))
+                else:
+                    continue
+                await timed_rerun()
+    finally:
+        session.close()
+    
+    if session.errors:
+        raise RuntimeError(f"Session {session_id} hit app exceptions: {session.errors[:3]}")
+    return latencies
+
+async def run_sessions(port, sessions, reruns, round_names, timeout):
+    results = await asyncio.gather(*(
+        run_session(i, port, reruns, round_names, timeout) for i in range(sessions)
+    ))
+    return [ms for latencies in results for ms in latencies]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent simulated sessions")
+    parser.add_argument("--reruns", type=int, default=2, help="passes over all views per session")
+    parser.add_argument("--athletes", type=int, default=24, help="athletes per synthetic round")
+    parser.add_argument("--timeout", type=float, default=60, help="startup and per-rerun timeout in seconds")
+    parser.add_argument("--max-p95-ms", type=float, default=DEFAULT_MAX_P95_MS)
+    parser.add_argument("--max-cpu-s-per-session", type=float, default=DEFAULT_MAX_CPU_S_PER_SESSION)
+    parser.add_argument("--max-rss-mb-per-session", type=float, default=DEFAULT_MAX_RSS_MB_PER_SESSION)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+    
+    from pipeline import SHEETS_URLS
+    round_names = list(SHEETS_URLS)
+    stub_server, urls = start_stub_server(round_names, args.athletes)
+    process, port = start_app_server(urls, args.timeout)
+    
+    try:
+        # Warm the shared caches so the report reflects steady-state viewers
+        asyncio.run(run_sessions(port, 1, 0, round_names, args.timeout))
+        
+        cpu_before, rss_before = get_process_usage(process.pid)
+        wall_before = time.perf_counter()
+        latencies = np.array(asyncio.run(
+            run_sessions(port, args.sessions, args.reruns, round_names, args.timeout)
+        ))
+        wall_s = time.perf_counter() - wall_before
+        cpu_after, rss_after = get_process_usage(process.pid)
+    finally:
+        process.terminate()
+        process.wait()
+        stub_server.shutdown()
+    
+    cpu_per_session = (cpu_after - cpu_before) / args.sessions
+    rss_per_session_mb = max(0, rss_after - rss_before) / args.sessions / 2**20
+    
+    report = {
+        'sessions': args.sessions,
+        'reruns': int(latencies.size),
+        'wall_s': round(wall_s, 2),
+        'reruns_per_s': round(latencies.size / wall_s, 1),
+        'latency_ms': {
+            f"p{q}": round(float(np.percentile(latencies, q)), 1) for q in (50, 90, 95, 99)
+        },
+        'latency_ms_max': round(float(latencies.max()), 1),
+        'server_cpu_s_per_session': round(cpu_per_session, 3),
+        'server_rss_mb_per_session': round(rss_per_session_mb, 2),
+    }
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+    
+    failures = []
+    if report['latency_ms']['p95'] > args.max_p95_ms:
+        failures.append(f"p95 rerun latency {report['latency_ms']['p95']}ms > {args.max_p95_ms}ms")
+    if cpu_per_session > args.max_cpu_s_per_session:
+        failures.append(f"CPU {cpu_per_session:.2f}s/session > {args.max_cpu_s_per_session}s")
+    if rss_per_session_mb > args.max_rss_mb_per_session:
+        failures.append(f"RSS {rss_per_session_mb:.1f}MB/session > {args.max_rss_mb_per_session}MB")
+    
+    for failure in failures:
+        print(f"❌ Budget exceeded: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1421 @@
+"""UI-free data pipeline: fetch, parse, map, normalize and rank round results.
+
+    $ python pipeline.py exports/ --format parquet
+    $ python pipeline.py exports/ --format json --local-dir /srv/scoring
+
+The Streamlit app, the ingest worker and the static site all build on this
+module; importing it doesn't load Streamlit, so cron and batch jobs can run
+the same pipeline in a single plain Python process.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import traceback
+import unicodedata
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import requests
+from requests.adapters import HTTPAdapter
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+import simulation
+
+# Configuration
+SHEETS_URLS = {
+    "Male Boulder Semis": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=911620167",
+    "Female Boulder Semis": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=920221506",
+    "Male Boulder Final": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=1415967322",
+    "Female Boulder Final": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=299577805",
+    "Male Lead Semis": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=0",
+    "Female Lead Semis": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=352924417",
+    "Male Lead Final": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=1091240908",
+    "Female Lead Final": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=528108640"
+}
+
+# Override the rounds with a JSON {round name: CSV URL} mapping, e.g. a local stub
+if os.environ.get("IFSC_SHEETS_URLS"):
+    SHEETS_URLS = json.loads(os.environ["IFSC_SHEETS_URLS"])
+
+# Polling interval for "<round name>.csv" files written locally by the venue's
+# scoring system
+LOCAL_POLL_INTERVAL = 0.05  # seconds
+
+# Arrow snapshots published by ingest_worker.py
+SNAPSHOT_MANIFEST = "manifest.json"
+SNAPSHOT_POLL_INTERVAL = 0.25  # seconds
+
+# Adaptive Sheets polling: live rounds are polled every few seconds, rounds
+# that haven't started back off exponentially and finished rounds stop
+POLL_BASE_INTERVAL = {'live': 5, 'not_started': 30, 'unknown': 30}  # seconds
+POLL_MAX_INTERVAL = {'not_started': 600, 'unknown': 600}  # seconds
+POLL_MAX_WORKERS = 8
+FINAL_STATUSES = ('qualified', 'eliminated', 'podium')
+
+# Change events kept for the live ticker
+TICKER_SIZE = 200
+
+# Fetch client settings
+FETCH_CONNECT_TIMEOUT = 3.05  # seconds
+FETCH_READ_TIMEOUT = 10  # seconds
+FETCH_MAX_ATTEMPTS = 4
+FETCH_RETRY_STATUSES = {429, 500, 502, 503, 504}
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN = 60  # seconds before a half-open trial request
+
+# Column mapping and round names
+
+def get_column_mapping(round_name):
+    """Get the correct column mapping based on round type"""
+    if "Boulder Semis" in round_name:
+        return {
+            'name': 'Athlete Name',
+            'rank': 'Current Position',
+            'score': 'Total Score',
+            'worst_case': 'Worst Case Finish',
+            'boulder_cols': ['Boulder 1 Score', 'Boulder 2 Score', 'Boulder 3 Score', 'Boulder 4 Score'],
+            'strategy_cols': ['1st Place Strategy', '2nd Place Strategy', '3rd Place Strategy']
+        }
+    elif "Boulder Final" in round_name:
+        return {
+            'name': 'Name',
+            'rank': 'Current Rank',
+            'score': 'Manual Score',
+            'status': 'Status',
+            'worst_case': 'Worst Case Finish',
+            'boulder_cols': ['Boulder 1 Score', 'Boulder 2 Score', 'Boulder 3 Score', 'Boulder 4 Score'],
+            'points_cols': ['Points to 1st', 'Points to 2nd', 'Points to 3rd']
+        }
+    elif "Lead Semis" in round_name:
+        return {
+            'name': 'Name',
+            'rank': 'Current Rank', 
+            'score': 'Manual Score',
+            'status': 'Status',
+            'worst_case': 'Worst Case Finish',
+            'qualification_hold': 'Min to Qualify',
+            'hold_for_1st': 'Hold for 1st',
+            'hold_for_2nd': 'Hold for 2nd',
+            'hold_for_3rd': 'Hold for 3rd'
+        }
+    elif "Lead Final" in round_name:
+        return {
+            'name': 'Name',
+            'rank': 'Current Rank', 
+            'score': 'Manual Score',
+            'status': 'Status',
+            'worst_case': 'Worst Case Finish',
+            'hold_for_1st': 'Hold for 1st',
+            'hold_for_2nd': 'Hold for 2nd',
+            'hold_for_3rd': 'Hold for 3rd'
+        }
+    
+    return {}
+
+def get_round_schema(round_name):
+    """Get the compact ingest dtype for each mapped column of a round"""
+    schema = {}
+    
+    for key, value in get_column_mapping(round_name).items():
+        if key in ('rank', 'worst_case'):
+            dtype = 'Int16'
+        elif key == 'boulder_cols':
+            dtype = 'UInt8'  # Already packed as tops × 10 + zones
+        elif key == 'score':
+            dtype = 'lead_height' if "Lead" in round_name else 'Float32'
+        else:
+            dtype = 'category'
+        
+        columns = value if isinstance(value, list) else [value]
+        schema.update(dict.fromkeys(columns, dtype))
+    
+    return schema
+
+# "[<event> ]<gender> <discipline> <stage>", e.g. "Male Boulder Semis"
+ROUND_NAME_PATTERN = re.compile(
+    r"^(?:(?P<event>.+) )?(?P<gender>Male|Female) (?P<discipline>Boulder|Lead) (?P<stage>Semis|Final)$"
+)
+
+def parse_round_name(round_name):
+    """Split a round name into event, gender, discipline and stage, or None if it doesn't match"""
+    match = ROUND_NAME_PATTERN.match(round_name)
+    return match.groupdict() if match else None
+
+# Letters that Unicode decomposition leaves untouched but athletes' names are
+# commonly transliterated without
+NAME_TRANSLITERATIONS = str.maketrans({
+    'ø': 'o', 'đ': 'd', 'ł': 'l', 'ı': 'i', 'æ': 'ae', 'œ': 'oe', 'þ': 'th'
+})
+
+def normalize_name(name):
+    """Normalize an athlete name for accent-, case- and order-insensitive matching"""
+    if pd.isna(name):
+        return ""
+    
+    # Decompose accented characters and drop the combining marks
+    decomposed = unicodedata.normalize("NFKD", str(name).casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    stripped = stripped.translate(NAME_TRANSLITERATIONS)
+    
+    # Punctuation separates words; sorting makes "CHON Jongwon" == "Jongwon Chon"
+    tokens = re.sub(r"[\W_]+", " ", stripped).split()
+    return " ".join(sorted(tokens))
+
+def name_trigrams(key):
+    """Get the set of padded per-word trigrams for a normalized name"""
+    grams = set()
+    for token in key.split():
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+def slugify(text):
+    """Turn a round or athlete name into a file name"""
+    return re.sub(r"\W+", "-", text.lower()).strip("-")
+
+
+# Formatting
+
+def format_lead_height(value):
+    """Format a packed lead height back to hold notation"""
+    hold = int(value)
+    return f"{hold}+" if value - hold >= 0.5 else str(hold)
+
+def format_score(score, round_name):
+    """Format a round's score for display"""
+    if pd.isna(score):
+        return "N/A"
+    if isinstance(score, str):
+        return score
+    if "Lead" in round_name:
+        return format_lead_height(score)
+    return f"{float(score):g}"
+
+def format_boulder_score(score):
+    """Format boulder score for display"""
+    if pd.isna(score) or score == 0:
+        return "0T0Z"
+    
+    score_str = str(int(score))
+    if len(score_str) == 1:
+        return f"0T{score_str}Z"
+    elif len(score_str) == 2:
+        return f"{score_str[0]}T{score_str[1]}Z"
+    else:
+        return str(score)
+
+def get_boulder_status_class(score):
+    """Get CSS class for boulder performance"""
+    if pd.isna(score) or score == 0:
+        return "boulder-fail"
+    
+    # Results are packed as tops × 10 + zones, so a lone digit is a zone
+    if int(score) >= 10:  # Has top
+        return "boulder-top"
+    elif int(score) % 10 >= 1:  # Has zone
+        return "boulder-zone"
+    else:
+        return "boulder-fail"
+
+
+# Parsing and compact schema
+
+def read_csv_header(content):
+    """Read the column names from the first line of a CSV export"""
+    first_line = content.split(b"\n", 1)[0].decode("utf-8-sig")
+    return next(csv.reader([first_line]), [])
+
+def parse_round_csv(content, round_name):
+    """Parse a round export with pyarrow, reading only the columns its mapping uses"""
+    raw_names = {}
+    for raw_name in read_csv_header(content):
+        raw_names.setdefault(raw_name.strip(), raw_name)
+    
+    mapped = list(get_round_schema(round_name))
+    drift = {
+        'missing_columns': [col for col in mapped if col not in raw_names],
+        'unmapped_columns': [col for col in raw_names if col and col not in mapped]
+    }
+    
+    # Read mapped columns as text; apply_round_schema then types them and reports
+    # values that don't fit, instead of a whole parse failing on one bad cell
+    include = [raw_names[col] for col in mapped if col in raw_names]
+    try:
+        table = pa_csv.read_csv(
+            io.BytesIO(content),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=include,
+                column_types={col: pa.string() for col in include},
+                strings_can_be_null=True
+            )
+        )
+        df = table.to_pandas()
+    except pa.ArrowInvalid:
+        # Ragged or otherwise malformed exports still parse with pandas
+        df = pd.read_csv(io.BytesIO(content), usecols=include, dtype=str)
+    
+    df.columns = df.columns.str.strip()
+    return df, drift
+
+def pack_lead_heights(series):
+    """Pack lead heights like "35+" into floats (35.5), or None if any value won't parse"""
+    text = series.dropna().astype(str)
+    parts = text.str.extract(r"^\s*(\d+)(?:\.0)?\s*(\+?)\s*$")
+    if parts[0].isna().any():
+        return None
+    
+    packed = parts[0].astype(float) + (parts[1] == "+") * 0.5
+    return packed.reindex(series.index).astype('Float32')
+
+def convert_column(series, dtype):
+    """Convert a column to a compact dtype, or return None if that would lose data"""
+    if dtype == 'category':
+        return series.astype('category')
+    if dtype == 'lead_height':
+        return pack_lead_heights(series)
+    
+    numeric = pd.to_numeric(series, errors='coerce')
+    # Text that doesn't parse would silently become missing
+    if numeric.notna().sum() != series.notna().sum():
+        return None
+    
+    if dtype.startswith(('Int', 'UInt')):
+        values = numeric.dropna()
+        bounds = np.iinfo(dtype.lower())
+        if not ((values % 1 == 0) & values.between(bounds.min, bounds.max)).all():
+            return None
+    
+    return numeric.astype(dtype)
+
+def apply_round_schema(df, round_name):
+    """Convert a raw round frame to its compact schema, with before/after memory stats"""
+    schema = get_round_schema(round_name)
+    converted = {}
+    kept_as_text = []
+    
+    for col in df.columns:
+        series = df[col]
+        if col in schema:
+            compact = convert_column(series, schema[col])
+            if compact is None:
+                # Unexpected values: keep them as text rather than mis-type them
+                kept_as_text.append(col)
+                compact = series.astype('category')
+        elif series.dtype == object and series.nunique() <= len(series) // 2:
+            # Repetitive unmapped helper text
+            compact = series.astype('category')
+        else:
+            compact = series
+        converted[col] = compact
+    
+    compact_df = pd.DataFrame(converted, index=df.index)
+    stats = {
+        'bytes_before': int(df.memory_usage(deep=True).sum()),
+        'bytes_after': int(compact_df.memory_usage(deep=True).sum()),
+        'kept_as_text': kept_as_text
+    }
+    return compact_df, stats
+
+def profile_columns(round_name, df, stats=None):
+    """Profile every column of a round in one vectorized pass: dtype, nulls, distinct values and mapping.
+    
+    With ingest ``stats``, mapped columns missing from the sheet and sheet
+    columns skipped at parse are listed too, without values.
+    """
+    roles = {}
+    for key, value in get_column_mapping(round_name).items():
+        if isinstance(value, list):
+            roles.update({col: f"{key}[{i}]" for i, col in enumerate(value, 1)})
+        else:
+            roles[value] = key
+    
+    nulls = df.isna().sum()
+    profile = pd.DataFrame({
+        'column': df.columns,
+        'status': ["mapped" if col in roles else "unmapped" for col in df.columns],
+        'role': [roles.get(col, "") for col in df.columns],
+        'dtype': df.dtypes.astype(str).to_numpy(),
+        'nulls': nulls.to_numpy(),
+        'null_pct': (nulls / max(len(df), 1)).round(3).to_numpy(),
+        'distinct': df.nunique().to_numpy()
+    })
+    
+    stats = stats or {}
+    absent = pd.DataFrame(
+        [{'column': col, 'status': "missing", 'role': roles.get(col, "")}
+         for col in stats.get('missing_columns', [])]
+        + [{'column': col, 'status': "skipped"}
+           for col in stats.get('unmapped_columns', []) if col not in profile['column'].values],
+        columns=['column', 'status', 'role']
+    )
+    if not absent.empty:
+        profile = pd.concat([profile, absent.fillna("")], ignore_index=True)
+    return profile.astype({'nulls': 'Int64', 'distinct': 'Int64'})
+
+def diff_column_profiles(previous, current):
+    """List columns added, removed, retyped or remapped between two profiles of a round"""
+    columns = ['column', 'change', 'status_before', 'status_after', 'dtype_before', 'dtype_after']
+    if previous is None or current is None:
+        return pd.DataFrame(columns=columns)
+    
+    # Outer join on the column name; "missing" means the sheet didn't have it
+    joined = previous.set_index('column')[['status', 'dtype']].join(
+        current.set_index('column')[['status', 'dtype']], how='outer', lsuffix='_before', rsuffix='_after'
+    )
+    before = joined['status_before'].fillna("missing") != "missing"
+    after = joined['status_after'].fillna("missing") != "missing"
+    changed = (joined['status_before'] != joined['status_after']) | (
+        joined['dtype_before'].fillna("") != joined['dtype_after'].fillna("")
+    )
+    joined['change'] = np.select(
+        [~before & after, before & ~after, before & after & changed],
+        ["added", "removed", "changed"],
+        default=""
+    )
+    return joined[joined['change'] != ""].reset_index()[columns]
+
+
+# Fetching
+
+class CircuitOpenError(Exception):
+    """Raised when a URL's circuit breaker is open and the request is skipped"""
+
+class CircuitBreaker:
+    """Per-URL breaker that stops requests after repeated failures"""
+    
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+    
+    def allow(self):
+        """Check whether a request may go out, moving to half-open after the cooldown"""
+        with self.lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                # Let exactly one trial request through
+                self.state = "half-open"
+                return True
+            return False
+    
+    def record_success(self):
+        with self.lock:
+            self.state = "closed"
+            self.failures = 0
+            self.opened_at = None
+    
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == "half-open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+    
+    def seconds_until_retry(self):
+        with self.lock:
+            if self.state != "open":
+                return 0
+            return max(0, self.cooldown - (time.monotonic() - self.opened_at))
+
+def is_retryable_error(error):
+    """Retry timeouts, connection errors and throttling/server error responses"""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in FETCH_RETRY_STATUSES
+    return False
+
+class SheetsFetchClient:
+    """Pooled HTTP client for Sheets CSV exports with retries and circuit breakers"""
+    
+    def __init__(self):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=len(SHEETS_URLS) * 2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.breakers = defaultdict(CircuitBreaker)
+        self.stats = defaultdict(lambda: {
+            'requests': 0, 'retries': 0, 'failures': 0,
+            'last_error': "", 'last_latency_ms': None, 'last_success': None
+        })
+        self.lock = threading.Lock()
+    
+    def _wait(self, retry_state):
+        """Jittered exponential backoff that honours a numeric Retry-After header"""
+        delay = wait_random_exponential(multiplier=0.5, max=8)(retry_state)
+        error = retry_state.outcome.exception()
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+        if retry_after.isdigit():
+            delay = max(delay, min(int(retry_after), 30))
+        return delay
+    
+    def _record(self, url, **updates):
+        with self.lock:
+            stats = self.stats[url]
+            for key, value in updates.items():
+                stats[key] = stats[key] + value if key in ('requests', 'retries', 'failures') else value
+    
+    def _get(self, url):
+        self._record(url, requests=1)
+        response = self.session.get(url, timeout=(FETCH_CONNECT_TIMEOUT, FETCH_READ_TIMEOUT))
+        response.raise_for_status()
+        return response.content
+    
+    def fetch(self, url):
+        """Fetch a URL's body, retrying transient errors and respecting its breaker"""
+        breaker = self.breakers[url]
+        if not breaker.allow():
+            raise CircuitOpenError(
+                f"Circuit open after repeated failures; retrying in {breaker.seconds_until_retry():.0f}s"
+            )
+        
+        retrying = Retrying(
+            stop=stop_after_attempt(FETCH_MAX_ATTEMPTS),
+            wait=self._wait,
+            retry=retry_if_exception(is_retryable_error),
+            before_sleep=lambda retry_state: self._record(url, retries=1),
+            reraise=True
+        )
+        
+        started = time.perf_counter()
+        try:
+            content = retrying(self._get, url)
+        except Exception as e:
+            breaker.record_failure()
+            self._record(url, failures=1, last_error=str(e))
+            raise
+        
+        breaker.record_success()
+        self._record(url, last_latency_ms=round((time.perf_counter() - started) * 1000, 1),
+                     last_success=datetime.now().strftime("%H:%M:%S"))
+        return content
+    
+    def get_status(self):
+        """Summarize retry and breaker state per URL for Debug Mode"""
+        with self.lock:
+            stats = {url: dict(values) for url, values in self.stats.items()}
+        
+        return [
+            {
+                'url': url,
+                'breaker': self.breakers[url].state,
+                'consecutive_failures': self.breakers[url].failures,
+                'retry_in_s': round(self.breakers[url].seconds_until_retry()),
+                **values
+            }
+            for url, values in stats.items()
+        ]
+
+
+# Round store and change events
+
+def key_round_rows(df, round_name):
+    """Index a round's tracked columns by normalized athlete name.
+    
+    Returns the keyed tracked columns, a hash of those per athlete, and a hash
+    of the athlete's whole row.
+    """
+    cols_mapping = get_column_mapping(round_name)
+    name_col = cols_mapping.get('name', 'Name')
+    if name_col not in df.columns:
+        return None
+    
+    tracked = [cols_mapping.get(key) for key in ('rank', 'status', 'score')]
+    tracked = [col for col in tracked + cols_mapping.get('boulder_cols', []) if col in df.columns]
+    
+    # Mapping a categorical only normalizes each distinct name once
+    keys = df[name_col].map(normalize_name)
+    labels = df.index[(keys.notna() & (keys != "")).to_numpy()]
+    labels = labels[~keys[labels].duplicated().to_numpy()]
+    keyed = df.loc[labels, [name_col] + tracked]
+    keyed.index = keys[labels]
+    
+    hashes = pd.Series(pd.util.hash_pandas_object(keyed[tracked], index=False).to_numpy(), index=keyed.index)
+    row_hashes = pd.Series(pd.util.hash_pandas_object(df.loc[labels], index=False).to_numpy(), index=keyed.index)
+    return keyed, hashes, row_hashes
+
+def changed_athlete_keys(previous_keys, current_keys):
+    """Keys of athletes added, removed or changed in any column between two versions of a round"""
+    previous = previous_keys[2] if previous_keys is not None else pd.Series(dtype='uint64')
+    current = current_keys[2] if current_keys is not None else pd.Series(dtype='uint64')
+    
+    common = current.index.intersection(previous.index)
+    changed = common[current[common].to_numpy() != previous[common].to_numpy()]
+    return set(changed) | set(current.index.difference(previous.index)) | set(previous.index.difference(current.index))
+
+def detect_round_changes(round_name, previous_keys, current_keys):
+    """Compare consecutive versions of a round and emit typed change events"""
+    if previous_keys is None or current_keys is None:
+        return []
+    
+    previous, previous_hashes, _ = previous_keys
+    current, current_hashes, _ = current_keys
+    
+    # Only rows whose hash changed are inspected field by field
+    common = current_hashes.index.intersection(previous_hashes.index)
+    changed = common[current_hashes[common].to_numpy() != previous_hashes[common].to_numpy()]
+    if changed.empty:
+        return []
+    
+    cols_mapping = get_column_mapping(round_name)
+    old_rows = previous.loc[changed]
+    new_rows = current.loc[changed]
+    names = new_rows[cols_mapping.get('name', 'Name')].astype(str)
+    now = datetime.now()
+    events = []
+    
+    def emit(mask, event_type, describe):
+        for key in mask[mask].index:
+            events.append({'time': now, 'round': round_name, 'athlete': names[key], 'key': key,
+                           'type': event_type, 'text': describe(key)})
+    
+    def numeric(rows, col):
+        return pd.to_numeric(rows[col], errors='coerce').astype(float)
+    
+    def in_both(col):
+        # A column can appear or disappear between versions when the sheet drifts
+        return col in old_rows.columns and col in new_rows.columns
+    
+    for i, col in enumerate(cols_mapping.get('boulder_cols', []), 1):
+        if in_both(col):
+            # Boulder results are packed as tops × 10 + zones
+            old_result = numeric(old_rows, col).fillna(0)
+            new_result = numeric(new_rows, col).fillna(0)
+            new_top = (new_result // 10 >= 1) & (old_result // 10 < 1)
+            new_zone = (new_result % 10 >= 1) & (old_result % 10 < 1) & ~new_top
+            emit(new_top, "new_top", lambda key, i=i: f"🟢 {names[key]} tops B{i}")
+            emit(new_zone, "new_zone", lambda key, i=i: f"🟡 {names[key]} reaches the zone on B{i}")
+    
+    score_col = cols_mapping.get('score')
+    if "Lead" in round_name and in_both(score_col):
+        old_height = numeric(old_rows, score_col).fillna(-1)
+        new_height = numeric(new_rows, score_col)
+        emit(new_height > old_height, "new_high_point",
+             lambda key: f"🧗 {names[key]} reaches hold {format_lead_height(new_height[key])}")
+    
+    rank_col = cols_mapping.get('rank')
+    if in_both(rank_col):
+        old_rank = numeric(old_rows, rank_col)
+        new_rank = numeric(new_rows, rank_col)
+        moved = old_rank.notna() & new_rank.notna() & (old_rank != new_rank)
+        emit(moved, "rank_change", lambda key: (
+            f"{'⬆️' if new_rank[key] < old_rank[key] else '⬇️'} {names[key]} "
+            f"#{old_rank[key]:.0f} → #{new_rank[key]:.0f}"
+        ))
+    
+    status_col = cols_mapping.get('status')
+    if in_both(status_col):
+        old_status = old_rows[status_col].astype(object)
+        new_status = new_rows[status_col].astype(object)
+        updated = new_status.notna() & (new_status.astype(str).str.strip() != "") & (new_status != old_status)
+        emit(updated, "status_change", lambda key: f"📣 {names[key]}: {new_status[key]}")
+    
+    return events
+
+class RoundStore:
+    """Round frames shared read-only by every session of the server process"""
+    
+    def __init__(self):
+        self.frames = {}
+        self.versions = {}
+        self.published_at = {}
+        self.ingest_stats = {}
+        self.change_keys = {}
+        # (previous version's profile, current profile) per round
+        self.column_profiles = {}
+        # Bounded so long-running servers don't accumulate events
+        self.events = deque(maxlen=TICKER_SIZE)
+        self.event_seq = 0
+        # Called with each publish's change events and the keys of every athlete
+        # added, removed or changed in any column, outside the lock
+        self.listeners = []
+        self.lock = threading.Lock()
+    
+    def publish(self, round_name, df, stats=None):
+        """Swap in a round's new data, returning whether its content changed"""
+        version = int(pd.util.hash_pandas_object(df, index=False).sum())
+        
+        with self.lock:
+            if stats is not None:
+                self.ingest_stats[round_name] = stats
+            if self.versions.get(round_name) == version:
+                return False
+            previous_keys = self.change_keys.get(round_name)
+        
+        change_keys = key_round_rows(df, round_name)
+        events = detect_round_changes(round_name, previous_keys, change_keys) if previous_keys else []
+        changed_keys = changed_athlete_keys(previous_keys, change_keys)
+        column_profile = profile_columns(round_name, df, stats)
+        
+        with self.lock:
+            # Readers hold references to the old dicts, so replace rather than mutate
+            frames = dict(self.frames, **{round_name: df})
+            versions = dict(self.versions, **{round_name: version})
+            self.frames = {name: frames[name] for name in SHEETS_URLS if name in frames}
+            self.versions = {name: versions[name] for name in self.frames}
+            self.published_at[round_name] = datetime.now()
+            self.change_keys[round_name] = change_keys
+            self.column_profiles[round_name] = (self.column_profiles.get(round_name, (None, None))[1], column_profile)
+            
+            for event in events:
+                self.event_seq += 1
+                event['seq'] = self.event_seq
+                self.events.append(event)
+        
+        if events or changed_keys:
+            for listener in self.listeners:
+                listener(events, changed_keys)
+        return True
+    
+    def snapshot(self):
+        """Get the current frames and a version key identifying them"""
+        with self.lock:
+            return self.frames, tuple(self.versions.items())
+    
+    def recent_events(self, limit=None):
+        """Get the newest change events first"""
+        with self.lock:
+            events = list(self.events)
+        return events[::-1][:limit]
+
+class FollowIndex:
+    """Athlete → sessions index routing change events to the sessions they concern.
+    
+    Sessions follow athletes, queueing their change events as notifications,
+    and watch the one athlete whose profile they show. Fanning out events costs
+    changed athletes × their sessions, whatever the total number of sessions.
+    """
+    
+    def __init__(self):
+        self.followers = defaultdict(set)
+        self.following = defaultdict(set)
+        self.watchers = defaultdict(set)
+        self.watching = {}
+        self.pending = defaultdict(lambda: deque(maxlen=TICKER_SIZE))
+        self.affected = set()
+        self.lock = threading.Lock()
+    
+    def follow(self, session_id, athlete_key):
+        with self.lock:
+            self.followers[athlete_key].add(session_id)
+            self.following[session_id].add(athlete_key)
+    
+    def unfollow(self, session_id, athlete_key):
+        with self.lock:
+            self._unlink(self.followers, athlete_key, session_id)
+            self._unlink(self.following, session_id, athlete_key)
+    
+    def followed(self, session_id):
+        with self.lock:
+            return set(self.following.get(session_id, ()))
+    
+    def watch(self, session_id, athlete_key=None):
+        """Set the athlete whose profile a session shows, None when it shows anything else"""
+        with self.lock:
+            previous = self.watching.pop(session_id, None)
+            if previous is not None:
+                self._unlink(self.watchers, previous, session_id)
+            if athlete_key is not None:
+                self.watching[session_id] = athlete_key
+                self.watchers[athlete_key].add(session_id)
+    
+    def fan_out(self, events, changed_keys=()):
+        """Queue events for their athletes' followers; mark them and the changed athletes' watchers affected"""
+        with self.lock:
+            for event in events:
+                for session_id in self.followers.get(event.get('key'), ()):
+                    self.pending[session_id].append(event)
+                    self.affected.add(session_id)
+            # A profile shows more columns than events cover, so any change to the row counts
+            for athlete_key in changed_keys:
+                self.affected.update(self.watchers.get(athlete_key, ()))
+    
+    def take_affected(self):
+        """Get and reset the sessions affected since the last call, with the watching sessions"""
+        with self.lock:
+            affected, self.affected = self.affected, set()
+            return affected, set(self.watching)
+    
+    def pop_pending(self, session_id):
+        """Get a session's undelivered change events, oldest first"""
+        with self.lock:
+            return list(self.pending.pop(session_id, ()))
+    
+    def prune(self, active_session_ids):
+        """Forget every session that is no longer connected"""
+        with self.lock:
+            stale = (set(self.following) | set(self.watching) | set(self.pending)) - active_session_ids
+        self.discard(stale)
+    
+    def discard(self, session_ids):
+        """Forget sessions that have disconnected"""
+        with self.lock:
+            for session_id in session_ids:
+                for athlete_key in self.following.pop(session_id, ()):
+                    self._unlink(self.followers, athlete_key, session_id)
+                watched = self.watching.pop(session_id, None)
+                if watched is not None:
+                    self._unlink(self.watchers, watched, session_id)
+                self.pending.pop(session_id, None)
+    
+    def _unlink(self, index, key, value):
+        # Empty sets are dropped so the index only holds live subscriptions
+        values = index.get(key)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del index[key]
+
+
+# Sources
+
+def get_round_state(df, round_name):
+    """Classify a round as "not_started", "live" or "finished" from its data"""
+    cols_mapping = get_column_mapping(round_name)
+    name_col = cols_mapping.get('name', 'Name')
+    if name_col not in df.columns:
+        return "unknown"
+    
+    athletes = df[df[name_col].notna()]
+    result_cols = [col for col in cols_mapping.get('boulder_cols', [cols_mapping.get('score')])
+                   if col in athletes.columns]
+    if athletes.empty or not result_cols:
+        return "not_started"
+    
+    # Empty or all-zero results mean nobody has climbed yet
+    results = athletes[result_cols].apply(pd.to_numeric, errors='coerce')
+    if (results.fillna(0) == 0).all().all():
+        return "not_started"
+    
+    status_col = cols_mapping.get('status')
+    if status_col in athletes.columns:
+        statuses = athletes[status_col].astype(str).str.lower()
+        if statuses.str.contains('|'.join(FINAL_STATUSES)).all():
+            return "finished"
+    
+    # Every placing is decided once nobody can drop below their current rank
+    rank_col = cols_mapping.get('rank')
+    worst_col = cols_mapping.get('worst_case')
+    if rank_col in athletes.columns and worst_col in athletes.columns:
+        ranks = pd.to_numeric(athletes[rank_col], errors='coerce')
+        worst = pd.to_numeric(athletes[worst_col], errors='coerce')
+        if ranks.notna().all() and worst.notna().all() and (ranks == worst).all():
+            return "finished"
+    
+    return "live"
+
+def run_guarded(poll, on_change):
+    """Run one poll pass of a source thread, logging any error so the thread keeps going"""
+    try:
+        if poll() and on_change is not None:
+            on_change()
+    except Exception:
+        traceback.print_exc()
+
+class LocalDirectorySource:
+    """Publishes rounds from a directory of CSVs as soon as a file changes"""
+    
+    def __init__(self, directory, store, interval=LOCAL_POLL_INTERVAL, on_change=None):
+        self.directory = directory
+        self.store = store
+        self.interval = interval
+        self.on_change = on_change
+        self.seen = {}
+        self.published = {}
+        self.failed = {}
+        self.errors = {}
+        self.thread = threading.Thread(target=self.run, name="local-data-source", daemon=True)
+    
+    def poll(self, settle=True):
+        """Publish rounds whose file changed, returning the rounds whose data changed"""
+        changed_rounds = []
+        
+        for round_name in SHEETS_URLS:
+            path = os.path.join(self.directory, f"{round_name}.csv")
+            try:
+                file_stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            
+            # An unchanged file costs a single stat call
+            signature = (file_stat.st_mtime_ns, file_stat.st_size)
+            previous = self.seen.get(round_name)
+            self.seen[round_name] = signature
+            # A file that failed to parse is retried only once it changes
+            if signature in (self.published.get(round_name), self.failed.get(round_name)):
+                continue
+            # Wait one interval for the signature to settle so we never read a
+            # half-written file (writers that rename into place settle at once)
+            if settle and signature != previous:
+                continue
+            
+            try:
+                with open(path, "rb") as round_file:
+                    df, drift = parse_round_csv(round_file.read(), round_name)
+                compact_df, stats = apply_round_schema(df, round_name)
+                stats.update(drift)
+                changed = self.store.publish(round_name, compact_df, stats)
+            except Exception as e:
+                self.errors[round_name] = str(e)
+                self.failed[round_name] = signature
+                continue
+            
+            self.published[round_name] = signature
+            self.failed.pop(round_name, None)
+            self.errors.pop(round_name, None)
+            if changed:
+                changed_rounds.append(round_name)
+        
+        return changed_rounds
+    
+    def run(self):
+        while True:
+            run_guarded(self.poll, self.on_change)
+            time.sleep(self.interval)
+
+def write_atomically(path, write):
+    """Write a file through a temporary sibling and rename it into place"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            write(tmp_file)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def read_round_snapshot(path):
+    """Read a round's Arrow IPC snapshot into a frame with the worker's dtypes"""
+    # to_pandas copies the columns into the replica's memory anyway, so a
+    # plain read is as good as a memory map here
+    with pa.OSFile(path) as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+class SnapshotDirectorySource:
+    """Publishes rounds from the snapshot files an ingest worker writes"""
+    
+    def __init__(self, directory, store, interval=SNAPSHOT_POLL_INTERVAL, on_change=None):
+        self.directory = directory
+        self.store = store
+        self.interval = interval
+        self.on_change = on_change
+        self.manifest_signature = None
+        self.published = {}
+        self.worker_errors = {}
+        self.errors = {}
+        self.written_at = None
+        self.thread = threading.Thread(target=self.run, name="snapshot-source", daemon=True)
+    
+    def poll(self):
+        """Publish rounds whose snapshot file changed, returning the rounds whose data changed"""
+        manifest_path = os.path.join(self.directory, SNAPSHOT_MANIFEST)
+        try:
+            file_stat = os.stat(manifest_path)
+        except FileNotFoundError:
+            self.errors = {'manifest': f"waiting for the ingest worker to write {manifest_path}"}
+            return []
+        
+        # The worker replaces the manifest atomically, so an unchanged
+        # signature means there is nothing new to read
+        signature = (file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino)
+        if signature == self.manifest_signature:
+            return []
+        
+        try:
+            with open(manifest_path) as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError) as e:
+            self.errors = {'manifest': str(e)}
+            return []
+        
+        changed_rounds = []
+        errors = {}
+        for round_name, entry in manifest['rounds'].items():
+            if self.published.get(round_name) == entry['file']:
+                continue
+            try:
+                df = read_round_snapshot(os.path.join(self.directory, entry['file']))
+                changed = self.store.publish(round_name, df, entry.get('stats'))
+            except Exception as e:
+                errors[round_name] = str(e)
+                continue
+            
+            self.published[round_name] = entry['file']
+            if changed:
+                changed_rounds.append(round_name)
+        
+        # Retry the whole manifest on the next poll if any snapshot couldn't be read
+        self.manifest_signature = None if errors else signature
+        self.errors = errors
+        self.worker_errors = manifest.get('errors', {})
+        self.written_at = datetime.fromisoformat(manifest['written_at'])
+        return changed_rounds
+    
+    def run(self):
+        while True:
+            run_guarded(self.poll, self.on_change)
+            time.sleep(self.interval)
+
+class SheetsSource:
+    """Polls each round's Sheets export on a schedule adapted to the round's state"""
+    
+    def __init__(self, store, client, on_change=None, max_workers=POLL_MAX_WORKERS):
+        self.store = store
+        self.client = client
+        self.on_change = on_change
+        self.schedule = {
+            round_name: {'state': "unknown", 'interval': 0, 'next_poll': 0.0, 'unchanged': 0, 'polls': 0}
+            for round_name in SHEETS_URLS
+        }
+        self.errors = {}
+        self.refresh_requested = False
+        self.started = False
+        self.poll_lock = threading.Lock()
+        self.start_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="sheets-fetch")
+        self.thread = threading.Thread(target=self.run, name="sheets-source", daemon=True)
+    
+    def reschedule(self, round_name, state, changed):
+        """Poll live rounds often, back off while a round hasn't started, stop once finished"""
+        entry = self.schedule[round_name]
+        entry['state'] = state
+        entry['unchanged'] = 0 if changed else entry['unchanged'] + 1
+        
+        if state == "finished":
+            entry['interval'] = entry['next_poll'] = None
+        elif state == "live":
+            # A quiet spell in a live round doesn't mean the next attempt is far off
+            entry['interval'] = POLL_BASE_INTERVAL[state]
+            entry['next_poll'] = time.monotonic() + entry['interval']
+        else:
+            interval = min(POLL_BASE_INTERVAL[state] * 2 ** entry['unchanged'], POLL_MAX_INTERVAL[state])
+            entry['interval'] = interval
+            entry['next_poll'] = time.monotonic() + interval
+    
+    def poll_round(self, round_name):
+        """Fetch and publish one round, returning whether its data changed"""
+        self.schedule[round_name]['polls'] += 1
+        try:
+            content = self.client.fetch(SHEETS_URLS[round_name])
+            df, drift = parse_round_csv(content, round_name)
+            compact_df, stats = apply_round_schema(df, round_name)
+            stats.update(drift)
+            changed = not compact_df.empty and self.store.publish(round_name, compact_df, stats)
+            state = get_round_state(compact_df, round_name)
+        except Exception as e:
+            self.errors[round_name] = str(e)
+            self.reschedule(round_name, self.schedule[round_name]['state'], changed=False)
+            return False
+        
+        self.errors.pop(round_name, None)
+        self.reschedule(round_name, state, changed)
+        return changed
+    
+    def poll(self):
+        """Poll every round that is due, returning the rounds whose data changed"""
+        with self.poll_lock:
+            if self.refresh_requested:
+                self.refresh_requested = False
+                for entry in self.schedule.values():
+                    entry['unchanged'] = 0
+                    entry['next_poll'] = 0.0
+            
+            now = time.monotonic()
+            due_rounds = [round_name for round_name, entry in self.schedule.items()
+                          if entry['next_poll'] is not None and entry['next_poll'] <= now]
+            # Fetched concurrently so one slow export doesn't hold up the other rounds
+            changed = self.executor.map(self.poll_round, due_rounds)
+            return [round_name for round_name, round_changed in zip(due_rounds, changed) if round_changed]
+    
+    def refresh_all(self):
+        """Make every round due on the next poll, including finished ones"""
+        # Only sets a flag, so a button press never waits for a poll in progress
+        self.refresh_requested = True
+        self.wake.set()
+    
+    def start(self):
+        self.started = True
+        self.thread.start()
+    
+    def seconds_until_next_poll(self):
+        pending = [entry['next_poll'] for entry in self.schedule.values() if entry['next_poll'] is not None]
+        return max(0.0, min(pending) - time.monotonic()) if pending else None
+    
+    def run(self):
+        while True:
+            run_guarded(self.poll, self.on_change)
+            self.wake.wait(self.seconds_until_next_poll())
+            self.wake.clear()
+
+
+# Derived tables
+
+def build_athlete_index(all_data):
+    """Build a trigram index over normalized athlete names"""
+    names = []
+    keys = []
+    rows = []
+    key_ids = {}
+    
+    for round_name, df in all_data.items():
+        name_col = get_column_mapping(round_name).get('name', 'Name')
+        if name_col not in df.columns:
+            continue
+        
+        for row_label, raw_name in df[name_col].items():
+            key = normalize_name(raw_name)
+            if not key:
+                continue
+            
+            athlete_id = key_ids.get(key)
+            if athlete_id is None:
+                athlete_id = key_ids[key] = len(names)
+                names.append(" ".join(str(raw_name).split()))
+                keys.append(key)
+                rows.append({})
+            rows[athlete_id].setdefault(round_name, row_label)
+    
+    grams = defaultdict(list)
+    gram_counts = []
+    for athlete_id, key in enumerate(keys):
+        athlete_grams = name_trigrams(key)
+        gram_counts.append(len(athlete_grams))
+        for gram in athlete_grams:
+            grams[gram].append(athlete_id)
+    
+    return {
+        'names': names,
+        'keys': keys,
+        'rows': rows,
+        'key_ids': key_ids,
+        'grams': dict(grams),
+        'gram_counts': gram_counts,
+        # Roster sorted on the normalized form so accents don't affect ordering
+        'sorted_ids': sorted(range(len(names)), key=lambda i: (keys[i], names[i]))
+    }
+
+def search_athletes(athlete_index, query, limit=10, min_coverage=0.5):
+    """Return ranked (athlete_id, score) matches for a free-text, typo-tolerant query"""
+    key = normalize_name(query)
+    if not key:
+        return []
+    
+    query_grams = name_trigrams(key)
+    shared_counts = defaultdict(int)
+    for gram in query_grams:
+        for athlete_id in athlete_index['grams'].get(gram, ()):
+            shared_counts[athlete_id] += 1
+    
+    matches = []
+    for athlete_id, shared in shared_counts.items():
+        # Coverage of the query ranks prefixes well; Dice breaks ties by length
+        coverage = shared / len(query_grams)
+        if coverage < min_coverage:
+            continue
+        dice = 2 * shared / (len(query_grams) + athlete_index['gram_counts'][athlete_id])
+        score = (coverage + dice) / 2
+        if athlete_index['keys'][athlete_id] == key:
+            score = 1.0
+        matches.append((athlete_id, round(score, 3)))
+    
+    matches.sort(key=lambda match: (-match[1], athlete_index['keys'][match[0]]))
+    return matches[:limit]
+
+def find_athlete(athlete_index, athlete_name):
+    """Resolve a name to its index id, falling back to the best fuzzy match"""
+    athlete_id = athlete_index['key_ids'].get(normalize_name(athlete_name))
+    if athlete_id is None:
+        matches = search_athletes(athlete_index, athlete_name, limit=1)
+        if matches:
+            athlete_id = matches[0][0]
+    return athlete_id
+
+def get_athlete_rows(athlete_index, all_data, athlete_id):
+    """Get an athlete's result row in every round they appear in"""
+    if athlete_id is None:
+        return {}
+    
+    return {
+        round_name: all_data[round_name].loc[row_label]
+        for round_name, row_label in athlete_index['rows'][athlete_id].items()
+        if round_name in all_data
+    }
+
+def build_results_table(all_data, athlete_index):
+    """Materialize long and wide athlete × round result tables"""
+    # Invert the name index into (row label, athlete id) pairs per round
+    round_rows = defaultdict(lambda: ([], []))
+    for athlete_id, rows in enumerate(athlete_index['rows']):
+        for round_name, row_label in rows.items():
+            round_rows[round_name][0].append(row_label)
+            round_rows[round_name][1].append(athlete_id)
+    
+    fields = {'rank': 'Rank', 'score': 'Score', 'status': 'Status', 'worst_case': 'Worst Case'}
+    round_frames = []
+    
+    for round_name, df in all_data.items():
+        if round_name not in round_rows:
+            continue
+        
+        row_labels, athlete_ids = round_rows[round_name]
+        cols_mapping = get_column_mapping(round_name)
+        present = {cols_mapping[key]: label for key, label in fields.items()
+                   if cols_mapping.get(key) in df.columns}
+        
+        round_frame = df.loc[row_labels, list(present)].rename(columns=present)
+        round_frame = round_frame.reset_index(drop=True)
+        if 'Score' in round_frame:
+            round_frame['Score'] = round_frame['Score'].map(lambda score: format_score(score, round_name))
+        round_frame.insert(0, 'athlete_id', athlete_ids)
+        round_frame.insert(1, 'Round', round_name)
+        round_frames.append(round_frame)
+    
+    columns = ['athlete_id', 'Round'] + list(fields.values())
+    if round_frames:
+        long_df = pd.concat(round_frames, ignore_index=True).reindex(columns=columns)
+    else:
+        long_df = pd.DataFrame(columns=columns)
+    
+    # Ranks arrive as mixed text; truncate like int(float(rank)) did before. A
+    # worst case kept as text in one round would otherwise mix ints and strings
+    for col in ('Rank', 'Worst Case'):
+        long_df[col] = np.trunc(pd.to_numeric(long_df[col], errors='coerce')).astype('Int64')
+    long_df['Round'] = pd.Categorical(long_df['Round'], categories=list(all_data))
+    long_df.insert(1, 'Athlete', pd.Series(athlete_index['names'], dtype=object)
+                   .reindex(long_df['athlete_id']).to_numpy())
+    
+    wide_df = long_df.pivot(index='athlete_id', columns='Round', values=list(fields.values()))
+    
+    return {'long': long_df, 'wide': wide_df}
+
+def estimate_round_probabilities(round_name, df):
+    """Estimate qualification and top-3 probabilities for a semi-final round"""
+    cols_mapping = get_column_mapping(round_name)
+    name_col = cols_mapping.get('name')
+    score_col = cols_mapping.get('score')
+    if "Semis" not in round_name or name_col not in df.columns or score_col not in df.columns:
+        return None
+    
+    athletes = df[df[name_col].notna()]
+    if 'boulder_cols' in cols_mapping:
+        boulder_cols = [col for col in cols_mapping['boulder_cols'] if col in athletes.columns]
+        if not boulder_cols:
+            return None
+        results = athletes[boulder_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        totals = pd.to_numeric(athletes[score_col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        probabilities = simulation.boulder_probabilities(results, totals)
+    else:
+        heights = pd.to_numeric(athletes[score_col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        probabilities = simulation.lead_probabilities(heights)
+    
+    if probabilities is None:
+        return None
+    return pd.DataFrame(probabilities, index=athletes.index)
+
+def round_rank_frame(round_name, df):
+    """Extract a round's numeric ranks keyed by normalized athlete name"""
+    cols_mapping = get_column_mapping(round_name)
+    name_col = cols_mapping.get('name', 'Name')
+    rank_col = cols_mapping.get('rank')
+    if name_col not in df.columns or rank_col not in df.columns:
+        return pd.DataFrame({'Athlete': pd.Series(dtype=object), 'Rank': pd.Series(dtype=float)})
+    
+    ranks = pd.DataFrame({
+        'Athlete': df[name_col].astype(object),
+        'Rank': np.trunc(pd.to_numeric(df[rank_col], errors='coerce')).astype(float)
+    })
+    # Copied because comparing a read-only object array fails under copy-on-write
+    keys = df[name_col].map(normalize_name).to_numpy(dtype=object, copy=True)
+    ranks.index = keys
+    ranks = ranks[(keys != "") & ranks['Rank'].notna().to_numpy()]
+    return ranks[~ranks.index.duplicated()]
+
+def combine_standings(round_ranks):
+    """Rank athletes who have a rank in both disciplines by the product of those ranks.
+    
+    ``round_ranks`` maps (discipline, stage) to a round_rank_frame. In each
+    discipline, finalists keep their final rank and everyone else their
+    semi-final rank.
+    """
+    disciplines = {}
+    names = []
+    for discipline in ("Boulder", "Lead"):
+        semis = round_ranks.get((discipline, "Semis"))
+        final = round_ranks.get((discipline, "Final"))
+        stages = [frame for frame in (final, semis) if frame is not None]
+        if not stages:
+            return pd.DataFrame(columns=['Rank', 'Athlete', 'Boulder', 'Lead', 'Score'])
+        
+        ranks = stages[0]['Rank']
+        for frame in stages[1:]:
+            ranks = ranks.combine_first(frame['Rank'])
+        disciplines[discipline] = ranks
+        names.extend(frame['Athlete'] for frame in stages)
+    
+    # Index-aligned concat is a hash join on the normalized name
+    table = pd.concat(disciplines, axis=1, join='inner')
+    table['Score'] = table['Boulder'] * table['Lead']
+    table['Best'] = table[['Boulder', 'Lead']].min(axis=1)
+    table = table.sort_values(['Score', 'Best'])
+    
+    all_names = pd.concat(names)
+    table.insert(0, 'Athlete', all_names[~all_names.index.duplicated()].reindex(table.index))
+    # Ties on the product go to the better single-discipline rank; only rows
+    # equal on both share a rank
+    order_key = table['Score'] * (table['Best'].max() + 1) + table['Best']
+    table.insert(0, 'Rank', order_key.rank(method='min').astype(int))
+    table[['Boulder', 'Lead', 'Score']] = table[['Boulder', 'Lead', 'Score']].astype(int)
+    return table.drop(columns='Best').reset_index(drop=True)
+
+class CombinedStandings:
+    """Combined Boulder & Lead standings per event and gender, updated one round version at a time"""
+    
+    def __init__(self):
+        self.round_ranks = {}
+        self.tables = {}
+        self.lock = threading.Lock()
+    
+    def update(self, all_data, data_version):
+        """Refresh the standings touched by changed rounds, returning {(event, gender): table}"""
+        versions = dict(data_version)
+        
+        with self.lock:
+            # Only rounds with a new version are re-extracted
+            self.round_ranks = {
+                round_name: (
+                    self.round_ranks[round_name]
+                    if self.round_ranks.get(round_name, (None,))[0] == version
+                    else (version, round_rank_frame(round_name, all_data[round_name]))
+                )
+                for round_name, version in versions.items()
+            }
+            
+            groups = defaultdict(dict)
+            for round_name in versions:
+                parts = parse_round_name(round_name)
+                if parts:
+                    groups[(parts['event'], parts['gender'])][(parts['discipline'], parts['stage'])] = round_name
+            
+            # Only groups with a changed round are recombined
+            tables = {}
+            for group, group_rounds in groups.items():
+                group_key = tuple(sorted((round_name, versions[round_name]) for round_name in group_rounds.values()))
+                cached = self.tables.get(group)
+                if cached and cached[0] == group_key:
+                    tables[group] = cached
+                else:
+                    round_ranks = {stage: self.round_ranks[round_name][1] for stage, round_name in group_rounds.items()}
+                    tables[group] = (group_key, combine_standings(round_ranks))
+            self.tables = tables
+            
+            return {group: table for group, (_, table) in tables.items()}
+
+
+# Command line
+
+def ingest_round(round_name, local_dir=None, client=None):
+    """Fetch or read one round and parse it into its compact frame"""
+    if local_dir:
+        with open(os.path.join(local_dir, f"{round_name}.csv"), "rb") as round_file:
+            content = round_file.read()
+    else:
+        content = client.fetch(SHEETS_URLS[round_name])
+    
+    df, drift = parse_round_csv(content, round_name)
+    compact_df, stats = apply_round_schema(df, round_name)
+    stats.update(drift)
+    return compact_df, stats
+
+def run_pipeline(local_dir=None, max_workers=8):
+    """Ingest every round concurrently into a fresh store, returning it with per-round errors"""
+    store = RoundStore()
+    client = None if local_dir else SheetsFetchClient()
+    errors = {}
+    
+    with ThreadPoolExecutor(max_workers) as pool:
+        futures = {round_name: pool.submit(ingest_round, round_name, local_dir, client)
+                   for round_name in SHEETS_URLS}
+    
+    for round_name, future in futures.items():
+        try:
+            compact_df, stats = future.result()
+        except Exception as e:
+            errors[round_name] = str(e)
+            continue
+        if not compact_df.empty:
+            store.publish(round_name, compact_df, stats)
+    
+    return store, errors
+
+def export_rounds(store, directory, file_format="parquet", errors=None):
+    """Write every round, the athlete × round results table and a summary to a directory"""
+    frames, data_version = store.snapshot()
+    athlete_index = build_athlete_index(frames)
+    results_table = build_results_table(frames, athlete_index)
+    os.makedirs(os.path.join(directory, "rounds"), exist_ok=True)
+    
+    def write_table(df, name):
+        path = os.path.join(directory, f"{name}.{file_format}")
+        if file_format == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_json(path, orient="records", indent=2, force_ascii=False)
+        return os.path.relpath(path, directory)
+    
+    summary = {
+        'generated_at': datetime.now().isoformat(),
+        'results': write_table(results_table['long'], "results"),
+        'rounds': {
+            round_name: {
+                'file': write_table(frames[round_name], f"rounds/{slugify(round_name)}"),
+                'version': version,
+                'state': get_round_state(frames[round_name], round_name),
+                'athletes': len(frames[round_name]),
+                'stats': store.ingest_stats.get(round_name)
+            }
+            for round_name, version in data_version
+        },
+        'errors': errors or {}
+    }
+    with open(os.path.join(directory, "summary.json"), "w") as summary_file:
+        json.dump(summary, summary_file, indent=2, default=str)
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="output directory for the round files and summary.json")
+    parser.add_argument("--format", choices=("parquet", "json"), default="parquet")
+    parser.add_argument("--local-dir", help='read "<round name>.csv" files from this directory instead of the Sheets')
+    args = parser.parse_args()
+    
+    started = time.perf_counter()
+    store, errors = run_pipeline(args.local_dir)
+    summary = export_rounds(store, args.directory, args.format, errors)
+    print(f"exported {len(summary['rounds'])} rounds to {args.directory} in {time.perf_counter() - started:.2f}s")
+    
+    for round_name, error in errors.items():
+        print(f"error {round_name}: {error}")
+    if errors:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Monte Carlo qualification and podium probabilities for semi-final rounds.
+
+Results still to come are sampled from the empirical distribution of results
+already posted in the same round: per boulder for Boulder, over heights for
+Lead. Everything is vectorized over simulations, and chunks of simulations can
+be spread over a process pool. This module stays free of Streamlit so pool
+workers can import it.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+FINALISTS = 8
+PODIUM = 3
+DEFAULT_SIMULATIONS = 100_000
+
+# Points per boulder under the 2025 rules; attempt deductions are not in the export
+BOULDER_POINTS = np.array([0, 10, 25], dtype=np.float32)  # nothing, zone, top
+
+def boulder_outcomes(results):
+    """Classify packed boulder results (tops × 10 + zones) as 0 nothing, 1 zone, 2 top"""
+    return np.where(results >= 10, 2, np.where(results % 10 >= 1, 1, 0))
+
+def boulder_outcome_probabilities(results):
+    """Per-boulder outcome probabilities among athletes who climbed it, add-one smoothed"""
+    climbed = ~np.isnan(results)
+    outcomes = boulder_outcomes(np.nan_to_num(results))
+    counts = np.stack([((outcomes == k) & climbed).sum(axis=0) for k in range(3)], axis=1) + 1
+    return counts / counts.sum(axis=1, keepdims=True)
+
+def count_top_finishes(scores, quotas, rng):
+    """Count how often each athlete finishes inside each quota across simulations"""
+    n_athletes = scores.shape[1]
+    # Random jitter below the scoring resolution breaks ties without favouring sheet order
+    scores += rng.random(scores.shape, dtype=np.float32) * 1e-3
+    
+    counts = {}
+    for quota in quotas:
+        if quota >= n_athletes:
+            counts[quota] = np.full(n_athletes, len(scores))
+            continue
+        top = np.argpartition(-scores, quota - 1, axis=1)[:, :quota]
+        counts[quota] = np.bincount(top.ravel(), minlength=n_athletes)
+    return counts
+
+def simulate_boulder_chunk(base_scores, remaining, probabilities, n_sims, quotas, seed):
+    """Simulate the remaining boulders of a round n_sims times"""
+    rng = np.random.default_rng(seed)
+    scores = np.tile(base_scores.astype(np.float32), (n_sims, 1))
+    
+    for boulder in range(remaining.shape[1]):
+        athletes = np.flatnonzero(remaining[:, boulder])
+        if athletes.size == 0:
+            continue
+        # Inverse-CDF sampling of nothing / zone / top for every pending attempt at once
+        draws = rng.random((n_sims, athletes.size), dtype=np.float32)
+        outcomes = np.searchsorted(np.cumsum(probabilities[boulder])[:-1], draws, side='right')
+        scores[:, athletes] += BOULDER_POINTS[outcomes]
+    
+    return count_top_finishes(scores, quotas, rng)
+
+def simulate_lead_chunk(heights, completed_heights, n_sims, quotas, seed):
+    """Simulate the athletes still to climb in a lead round n_sims times"""
+    rng = np.random.default_rng(seed)
+    scores = np.tile(np.nan_to_num(heights).astype(np.float32), (n_sims, 1))
+    
+    pending = np.flatnonzero(np.isnan(heights))
+    if pending.size:
+        scores[:, pending] = rng.choice(completed_heights, size=(n_sims, pending.size))
+    
+    return count_top_finishes(scores, quotas, rng)
+
+def run_simulation(simulate_chunk, args, n_sims, workers, seed):
+    """Run simulations in one process or split across a process pool, summing the counts"""
+    quotas = (FINALISTS, PODIUM)
+    if workers <= 1:
+        counts = simulate_chunk(*args, n_sims, quotas, seed)
+    else:
+        chunk_sizes = [len(chunk) for chunk in np.array_split(np.arange(n_sims), workers)]
+        seeds = np.random.SeedSequence(seed).spawn(workers)
+        with ProcessPoolExecutor(workers) as pool:
+            chunks = list(pool.map(simulate_chunk, *zip(*[
+                (*args, size, quotas, chunk_seed) for size, chunk_seed in zip(chunk_sizes, seeds)
+            ])))
+        counts = {quota: sum(chunk[quota] for chunk in chunks) for quota in quotas}
+    
+    return {
+        'qualify': counts[FINALISTS] / n_sims,
+        'podium': counts[PODIUM] / n_sims
+    }
+
+def boulder_probabilities(results, total_scores=None, n_sims=DEFAULT_SIMULATIONS, workers=1, seed=0):
+    """Qualification and podium probabilities for a boulder round.
+    
+    ``results`` holds packed boulder results per athlete (rows) and boulder
+    (columns), NaN where the boulder hasn't been climbed yet.
+    """
+    results = np.asarray(results, dtype=float)
+    remaining = np.isnan(results)
+    base_scores = BOULDER_POINTS[boulder_outcomes(np.nan_to_num(results))].sum(axis=1)
+    
+    # Finished athletes keep the sheet's total, which includes attempt deductions,
+    # as long as it is on the same points scale
+    if total_scores is not None:
+        total_scores = np.asarray(total_scores, dtype=float)
+        finished = ~remaining.any(axis=1) & ~np.isnan(total_scores)
+        if finished.any() and np.all(np.abs(total_scores[finished] - base_scores[finished]) <= 5):
+            base_scores = np.where(finished, total_scores, base_scores)
+    
+    args = (base_scores, remaining, boulder_outcome_probabilities(results))
+    return run_simulation(simulate_boulder_chunk, args, n_sims, workers, seed)
+
+def lead_probabilities(heights, n_sims=DEFAULT_SIMULATIONS, workers=1, seed=0):
+    """Qualification and podium probabilities for a lead round.
+    
+    ``heights`` holds each athlete's packed height (a "+" adds 0.5), NaN for
+    athletes still to climb. Returns None until at least one height is posted.
+    """
+    heights = np.asarray(heights, dtype=float)
+    completed_heights = heights[~np.isnan(heights)].astype(np.float32)
+    if completed_heights.size == 0:
+        return None
+    
+    return run_simulation(simulate_lead_chunk, (heights, completed_heights), n_sims, workers, seed)
@@ -0,0 +1,281 @@
+"""Static leaderboard pages regenerated whenever a round's data changes.
+
+    $ python static_site.py /srv/ifsc/site --snapshot-dir /srv/ifsc/snapshots
+    $ python ingest_worker.py /srv/ifsc/snapshots --site /srv/ifsc/site
+
+Renders an index plus one HTML and JSON page per round and per athlete, so
+casual viewers can be served by a plain file server or CDN instead of a
+Streamlit session each. Only the rounds whose version changed, and the
+athletes in them, are re-rendered.
+"""
+import argparse
+import html
+import json
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from pipeline import (
+    RoundStore,
+    SnapshotDirectorySource,
+    estimate_round_probabilities,
+    format_boulder_score,
+    format_score,
+    get_boulder_status_class,
+    get_column_mapping,
+    get_round_state,
+    normalize_name,
+    slugify,
+    write_atomically,
+)
+
+PAGE_STYLE = """
+body { font-family: system-ui, sans-serif; margin: 2rem auto; max-width: 960px; color: #2c3e50; }
+h1 { color: #e74c3c; }
+a { color: #2980b9; text-decoration: none; }
+table { border-collapse: collapse; width: 100%; }
+th, td { padding: 0.5rem; border-bottom: 1px solid #ecf0f1; text-align: left; }
+.boulder { display: inline-block; min-width: 3rem; padding: 0.2rem; border-radius: 6px;
+           color: white; font-family: monospace; font-weight: bold; text-align: center; }
+.boulder-top { background: #2ecc71; }
+.boulder-zone { background: #f1c40f; }
+.boulder-fail { background: #e74c3c; }
+.state { font-size: 0.9rem; color: #7f8c8d; }
+"""
+
+def format_cell(value):
+    """Format a sheet value for a page, with "N/A" for blanks"""
+    if pd.isna(value) or str(value).strip() == "":
+        return "N/A"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def round_leaderboard(round_name, df, probabilities=None):
+    """Flatten a round into display-ready leaderboard rows, ordered by rank"""
+    cols_mapping = get_column_mapping(round_name)
+    name_col = cols_mapping.get('name', 'Name')
+    rank_col = cols_mapping.get('rank')
+    if name_col not in df.columns:
+        return []
+    
+    athletes = df[df[name_col].notna() & (df[name_col] != "")]
+    if rank_col in athletes.columns:
+        ranks = pd.to_numeric(athletes[rank_col], errors='coerce')
+        athletes = athletes.loc[ranks.sort_values(na_position='last').index]
+    
+    rows = []
+    for row_label, athlete_data in athletes.iterrows():
+        name = str(athlete_data[name_col])
+        row = {
+            'rank': format_cell(athlete_data.get(rank_col)),
+            'name': name,
+            'slug': slugify(normalize_name(name)),
+            'score': format_score(athlete_data.get(cols_mapping.get('score')), round_name),
+            'status': format_cell(athlete_data.get(cols_mapping.get('status'))),
+            'worst_case': format_cell(athlete_data.get(cols_mapping.get('worst_case')))
+        }
+        
+        if 'boulder_cols' in cols_mapping:
+            # Pair the boulder notation with the app's top/zone/fail classes
+            row['boulders'] = [
+                {'result': format_boulder_score(score), 'class': get_boulder_status_class(score)}
+                for score in (athlete_data.get(col) for col in cols_mapping['boulder_cols'])
+            ]
+        else:
+            row['target_holds'] = {
+                key: format_cell(athlete_data.get(cols_mapping[key]))
+                for key in ('qualification_hold', 'hold_for_1st', 'hold_for_2nd', 'hold_for_3rd')
+                if key in cols_mapping
+            }
+        
+        if probabilities is not None and row_label in probabilities.index:
+            row['qualify'] = round(float(probabilities.at[row_label, 'qualify']), 3)
+            row['podium'] = round(float(probabilities.at[row_label, 'podium']), 3)
+        rows.append(row)
+    
+    return rows
+
+def render_page(title, body, depth=0):
+    """Wrap a page body in the shared layout"""
+    home = "../" * depth + "index.html"
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(title)} · IFSC 2025 Seoul World Championships</title>
+<style>{PAGE_STYLE}</style>
+</head>
+<body>
+<p><a href="{home}">🧗‍♀️ IFSC 2025 Seoul World Championships</a></p>
+<h1>{html.escape(title)}</h1>
+{body}
+</body>
+</html>
+"""
+
+def render_round_page(page):
+    """Render a round's leaderboard table"""
+    has_boulders = any('boulders' in row for row in page['athletes'])
+    has_probabilities = any('qualify' in row for row in page['athletes'])
+    
+    headers = ["Rank", "Athlete", "Score"]
+    if has_boulders:
+        headers.append("Boulders")
+    else:
+        headers.append("Target Holds")
+    headers += ["Status", "Worst Case"]
+    if has_probabilities:
+        headers += ["Qualify", "Top 3"]
+    
+    table_rows = []
+    for row in page['athletes']:
+        cells = [
+            html.escape(row['rank']),
+            f'<a href="../athletes/{row["slug"]}.html">{html.escape(row["name"])}</a>',
+            html.escape(row['score'])
+        ]
+        if has_boulders:
+            cells.append(" ".join(
+                f'<span class="boulder {boulder["class"]}">{boulder["result"]}</span>'
+                for boulder in row.get('boulders', [])
+            ))
+        else:
+            cells.append(", ".join(
+                f"{key.replace('_', ' ')}: {html.escape(value)}"
+                for key, value in row.get('target_holds', {}).items() if value != "N/A"
+            ))
+        cells += [html.escape(row['status']), html.escape(row['worst_case'])]
+        if has_probabilities:
+            cells += [f"{row['qualify']:.0%}" if 'qualify' in row else "",
+                      f"{row['podium']:.0%}" if 'podium' in row else ""]
+        table_rows.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>")
+    
+    body = f"""<p class="state">{page['state'].replace('_', ' ')} • {len(page['athletes'])} athletes • updated {page['updated']}</p>
+<table>
+<tr>{"".join(f"<th>{header}</th>" for header in headers)}</tr>
+{chr(10).join(table_rows)}
+</table>"""
+    return render_page(page['round'], body, depth=1)
+
+def render_athlete_page(page):
+    """Render an athlete's results across rounds"""
+    table_rows = [
+        f'<tr><td><a href="../rounds/{slugify(entry["round"])}.html">{html.escape(entry["round"])}</a></td>'
+        f'<td>{html.escape(entry["rank"])}</td><td>{html.escape(entry["score"])}</td>'
+        f'<td>{html.escape(entry["status"])}</td></tr>'
+        for entry in page['rounds']
+    ]
+    body = f"""<table>
+<tr><th>Round</th><th>Rank</th><th>Score</th><th>Status</th></tr>
+{chr(10).join(table_rows)}
+</table>"""
+    return render_page(page['name'], body, depth=1)
+
+def render_index_page(page):
+    """Render the list of rounds"""
+    items = [
+        f'<li><a href="rounds/{slugify(entry["round"])}.html">{html.escape(entry["round"])}</a> '
+        f'<span class="state">{entry["state"].replace("_", " ")} • updated {entry["updated"]}</span></li>'
+        for entry in page['rounds']
+    ]
+    body = f"<ul>\n{chr(10).join(items)}\n</ul>\n<p class=\"state\">Generated {page['generated']}</p>"
+    return render_page("Live Results", body)
+
+class StaticSite:
+    """Writes the static pages for a round store into an output directory"""
+    
+    def __init__(self, directory):
+        self.directory = directory
+        self.leaderboards = {}
+        os.makedirs(os.path.join(directory, "rounds"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "athletes"), exist_ok=True)
+    
+    def write_page(self, path, page, render):
+        """Write a page's HTML and JSON side by side, each atomically"""
+        base_path = os.path.join(self.directory, path)
+        write_atomically(f"{base_path}.json",
+                         lambda sink: sink.write(json.dumps(page, indent=2, ensure_ascii=False).encode()))
+        write_atomically(f"{base_path}.html", lambda sink: sink.write(render(page).encode()))
+    
+    def render(self, store, changed_rounds):
+        """Re-render the changed rounds, the athletes in them and the index"""
+        frames, data_version = store.snapshot()
+        versions = dict(data_version)
+        pages = {}
+        
+        for round_name in changed_rounds:
+            df = frames.get(round_name)
+            if df is None:
+                continue
+            probabilities = estimate_round_probabilities(round_name, df)
+            self.leaderboards[round_name] = round_leaderboard(round_name, df, probabilities)
+            pages[round_name] = {
+                'round': round_name,
+                'version': versions[round_name],
+                'state': get_round_state(df, round_name),
+                'updated': f"{store.published_at[round_name]:%Y-%m-%d %H:%M:%S}",
+                'athletes': self.leaderboards[round_name]
+            }
+            self.write_page(f"rounds/{slugify(round_name)}", pages[round_name], render_round_page)
+        
+        # An athlete page lists every round, so rebuild it from all leaderboards
+        changed_athletes = {row['slug'] for round_name in pages for row in self.leaderboards[round_name]}
+        athlete_pages = {}
+        for round_name in frames:
+            for row in self.leaderboards.get(round_name, []):
+                if row['slug'] not in changed_athletes:
+                    continue
+                athlete_page = athlete_pages.setdefault(row['slug'], {'name': row['name'], 'rounds': []})
+                athlete_page['rounds'].append({
+                    'round': round_name,
+                    **{key: row[key] for key in ('rank', 'score', 'status', 'worst_case')}
+                })
+        for slug, athlete_page in athlete_pages.items():
+            self.write_page(f"athletes/{slug}", athlete_page, render_athlete_page)
+        
+        index_page = {
+            'generated': f"{datetime.now():%Y-%m-%d %H:%M:%S}",
+            'rounds': [
+                {
+                    'round': round_name,
+                    'version': versions[round_name],
+                    'state': get_round_state(df, round_name),
+                    'updated': f"{store.published_at[round_name]:%Y-%m-%d %H:%M:%S}"
+                }
+                for round_name, df in frames.items()
+            ]
+        }
+        self.write_page("index", index_page, render_index_page)
+        return len(pages), len(athlete_pages)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="output directory served by a file server or CDN")
+    parser.add_argument("--snapshot-dir", required=True, help="snapshot directory written by ingest_worker.py")
+    parser.add_argument("--once", action="store_true", help="render the current snapshots and exit")
+    args = parser.parse_args()
+    
+    store = RoundStore()
+    source = SnapshotDirectorySource(args.snapshot_dir, store)
+    site = StaticSite(args.directory)
+    errors = {}
+    while True:
+        changed_rounds = source.poll()
+        if changed_rounds:
+            round_pages, athlete_pages = site.render(store, changed_rounds)
+            print(f"{datetime.now():%H:%M:%S} rendered {round_pages} rounds, {athlete_pages} athletes", flush=True)
+        if source.errors != errors:
+            errors = dict(source.errors)
+            for round_name, error in errors.items():
+                print(f"{datetime.now():%H:%M:%S} error {round_name}: {error}", flush=True)
+        
+        if args.once:
+            return
+        time.sleep(source.interval)
+
+if __name__ == "__main__":
+    main()
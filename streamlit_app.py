@@ -1,20 +1,61 @@
 import streamlit as st
 import pandas as pd
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import as_completed
 from datetime import datetime
+from functools import partial
 import plotly.express as px
-import plotly.graph_objects as go
+from charts import create_athlete_progression_chart
+from pipeline import (
+    SHEETS_URLS,
+    CombinedStandings,
+    FollowIndex,
+    LocalDirectorySource,
+    SheetsFetchClient,
+    SheetsSource,
+    RoundStore,
+    SnapshotDirectorySource,
+    build_athlete_index,
+    build_results_table,
+    diff_column_profiles,
+    estimate_round_probabilities,
+    find_athlete,
+    format_boulder_score,
+    format_score,
+    get_athlete_rows,
+    get_boulder_status_class,
+    get_column_mapping,
+    normalize_name,
+    search_athletes,
+)
+import simulation
 
-# Configuration
-SHEETS_URLS = {
-    "Male Boulder Semis": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=911620167",
-    "Female Boulder Semis": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=920221506",
-    "Male Boulder Final": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=1415967322",
-    "Female Boulder Final": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=299577805",
-    "Male Lead Semis": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=0",
-    "Female Lead Semis": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=352924417",
-    "Male Lead Final": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=1091240908",
-    "Female Lead Final": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=528108640"
-}
+# Read rounds from "<round name>.csv" files written locally by the venue's
+# scoring system instead of polling the Google Sheets exports
+LOCAL_DATA_DIR = os.environ.get("IFSC_LOCAL_DATA_DIR")
+
+# Serve rounds from Arrow snapshots published by ingest_worker.py, so replicas
+# on a node share one upstream poller instead of each fetching the Sheets
+SNAPSHOT_DIR = os.environ.get("IFSC_SNAPSHOT_DIR")
+
+# Boulder card background per get_boulder_status_class
+BOULDER_STATUS_COLORS = {'boulder-top': "#2ecc71", 'boulder-zone': "#f1c40f", 'boulder-fail': "#e74c3c"}
+
+# On-demand profiling of a single view rerun, requested from Debug Mode or
+# with ?profile=1 in the URL
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_SAMPLE_INTERVAL = 0.005  # seconds
+PROFILE_TOP_FUNCTIONS = 30
+
+# Round frames are shared between sessions; copy-on-write keeps any per-session
+# modification from leaking into another viewer's data
+pd.set_option("mode.copy_on_write", True)
 
 def setup_page():
     """Configure Streamlit page settings"""
@@ -226,110 +267,141 @@ def setup_page():
     </style>
     """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_data(sheets_url):
-    """Load data from Google Sheets with error handling"""
+@st.cache_resource
+def get_fetch_client():
+    """Get the fetch client shared by all sessions"""
+    return SheetsFetchClient()
+
+@st.cache_resource
+def get_round_store():
+    """Get the round store shared by all sessions"""
+    return RoundStore()
+
+@st.cache_resource
+def get_follow_index():
+    """Get the athlete → sessions index, fed with every change event the store publishes"""
+    follow_index = FollowIndex()
+    get_round_store().listeners.append(follow_index.fan_out)
+    return follow_index
+
+def get_session_id():
+    """Get the id of the session running this script"""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
+
+def notify_sessions(session_ids=None, exclude=frozenset()):
+    """Ask connected sessions to rerun so they render newly published data.
+    
+    Returns the ids of all active sessions, or None without a runtime.
+    """
     try:
-        df = pd.read_csv(sheets_url)
-        # Clean up column names
-        df.columns = df.columns.str.strip()
-        return df
-    except Exception as e:
-        st.error(f"Error loading data: {str(e)}")
-        return pd.DataFrame()
+        from streamlit.runtime import Runtime
+        active_sessions = Runtime.instance()._session_mgr.list_active_sessions()
+    except Exception:
+        # No runtime (e.g. bare mode) or internals changed; sessions catch up on their next rerun
+        return None
+    
+    active_ids = set()
+    for session_info in active_sessions:
+        session_id = session_info.session.id
+        active_ids.add(session_id)
+        if (session_ids is None or session_id in session_ids) and session_id not in exclude:
+            # No client state keeps each session's current widget values
+            session_info.session.request_rerun(None)
+    return active_ids
 
-@st.cache_data(ttl=300)
-def load_all_data():
-    """Load all competition data"""
-    all_data = {}
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
-    for i, (round_name, url) in enumerate(SHEETS_URLS.items()):
-        status_text.text(f"Loading {round_name}...")
-        df = load_data(url)
-        if not df.empty:
-            all_data[round_name] = df
-        progress_bar.progress((i + 1) / len(SHEETS_URLS))
-    
-    status_text.text("✅ Data loading complete!")
-    progress_bar.empty()
-    status_text.empty()
-    
-    return all_data
+def notify_changes(follow_index):
+    """Rerun sessions after a poll published new data.
+    
+    Sessions showing one athlete's profile only rerun when that athlete (or
+    one they follow) changed; everyone else reruns to see the new data.
+    """
+    affected, watching = follow_index.take_affected()
+    active_ids = notify_sessions(exclude=watching - affected)
+    if active_ids is not None:
+        follow_index.prune(active_ids)
 
-def get_column_mapping(round_name):
-    """Get the correct column mapping based on round type"""
-    if "Boulder Semis" in round_name:
-        return {
-            'name': 'Athlete Name',
-            'rank': 'Current Position',
-            'score': 'Total Score',
-            'worst_case': 'Worst Case Finish',
-            'boulder_cols': ['Boulder 1 Score', 'Boulder 2 Score', 'Boulder 3 Score', 'Boulder 4 Score'],
-            'strategy_cols': ['1st Place Strategy', '2nd Place Strategy', '3rd Place Strategy']
-        }
-    elif "Boulder Final" in round_name:
-        return {
-            'name': 'Name',
-            'rank': 'Current Rank',
-            'score': 'Manual Score',
-            'status': 'Status',
-            'worst_case': 'Worst Case Finish',
-            'boulder_cols': ['Boulder 1 Score', 'Boulder 2 Score', 'Boulder 3 Score', 'Boulder 4 Score'],
-            'points_cols': ['Points to 1st', 'Points to 2nd', 'Points to 3rd']
-        }
-    elif "Lead Semis" in round_name:
-        return {
-            'name': 'Name',
-            'rank': 'Current Rank', 
-            'score': 'Manual Score',
-            'status': 'Status',
-            'worst_case': 'Worst Case Finish',
-            'qualification_hold': 'Min to Qualify',
-            'hold_for_1st': 'Hold for 1st',
-            'hold_for_2nd': 'Hold for 2nd',
-            'hold_for_3rd': 'Hold for 3rd'
-        }
-    elif "Lead Final" in round_name:
-        return {
-            'name': 'Name',
-            'rank': 'Current Rank', 
-            'score': 'Manual Score',
-            'status': 'Status',
-            'worst_case': 'Worst Case Finish',
-            'hold_for_1st': 'Hold for 1st',
-            'hold_for_2nd': 'Hold for 2nd',
-            'hold_for_3rd': 'Hold for 3rd'
-        }
+@st.cache_resource
+def get_local_source():
+    """Start the shared local directory watcher after a synchronous first scan"""
+    source = LocalDirectorySource(LOCAL_DATA_DIR, get_round_store(), on_change=partial(notify_changes, get_follow_index()))
+    source.poll(settle=False)
+    source.thread.start()
+    return source
+
+@st.cache_resource
+def get_snapshot_source():
+    """Start the shared snapshot watcher after a synchronous first read"""
+    source = SnapshotDirectorySource(SNAPSHOT_DIR, get_round_store(), on_change=partial(notify_changes, get_follow_index()))
+    source.poll()
+    source.thread.start()
+    return source
+
+@st.cache_resource
+def get_sheets_source():
+    """Get the Sheets poller shared by all sessions"""
+    return SheetsSource(get_round_store(), get_fetch_client(), on_change=partial(notify_changes, get_follow_index()))
+
+def load_all_data():
+    """Load all competition data from the shared store, starting its source on first use"""
+    store = get_round_store()
+    if SNAPSHOT_DIR:
+        # The ingest worker does all fetching; replicas only map its snapshots
+        get_snapshot_source()
+        return store.snapshot()
+    
+    if LOCAL_DATA_DIR:
+        # The watcher publishes changes itself and reruns open sessions
+        get_local_source()
+        return store.snapshot()
+    
+    source = get_sheets_source()
+    # Only the first session loads synchronously; afterwards the poller keeps
+    # the store fresh and reruns sessions when a round changes
+    with source.start_lock:
+        if not source.started:
+            progress_bar = st.progress(0)
+            status_text = st.empty()
+            
+            # Rounds load concurrently so one slow export doesn't hold up the rest
+            status_text.text(f"Loading {len(SHEETS_URLS)} rounds...")
+            futures = {source.executor.submit(source.poll_round, round_name): round_name
+                       for round_name in SHEETS_URLS}
+            for i, future in enumerate(as_completed(futures)):
+                round_name = futures[future]
+                error = source.errors.get(round_name)
+                if error is not None:
+                    st.error(f"Error loading {round_name}: {error}")
+                status_text.text(f"Loaded {round_name}")
+                progress_bar.progress((i + 1) / len(SHEETS_URLS))
+            
+            status_text.text("✅ Data loading complete!")
+            progress_bar.empty()
+            status_text.empty()
+            source.start()
     
-    return {}
+    return store.snapshot()
 
-def format_boulder_score(score):
-    """Format boulder score for display"""
-    if pd.isna(score) or score == 0:
-        return "0T0Z"
-    
-    score_str = str(int(score))
-    if len(score_str) == 1:
-        return f"0T{score_str}Z"
-    elif len(score_str) == 2:
-        return f"{score_str[0]}T{score_str[1]}Z"
-    else:
-        return str(score)
+@st.cache_resource(max_entries=4)
+def get_athlete_index(data_version, _all_data):
+    """Build the athlete name index once per data version"""
+    return build_athlete_index(_all_data)
 
-def get_boulder_status_class(score):
-    """Get CSS class for boulder performance"""
-    if pd.isna(score) or score == 0:
-        return "boulder-fail"
-    
-    score_str = str(int(score))
-    if len(score_str) >= 1 and score_str[0] == '1':  # Has top
-        return "boulder-top"
-    elif len(score_str) >= 2 and score_str[1] == '1':  # Has zone
-        return "boulder-zone"
-    else:
-        return "boulder-fail"
+@st.cache_resource(max_entries=4)
+def get_results_table(data_version, _all_data, _athlete_index):
+    """Build the athlete × round results tables once per data version"""
+    return build_results_table(_all_data, _athlete_index)
+
+@st.cache_resource
+def get_combined_standings():
+    """Get the combined standings shared by all sessions"""
+    return CombinedStandings()
+
+@st.cache_resource(max_entries=16)
+def get_round_probabilities(round_name, round_version, _df):
+    """Run the Monte Carlo estimate once per round version"""
+    return estimate_round_probabilities(round_name, _df)
 
 def display_boulder_performance(athlete_data, cols_mapping):
     """Display boulder performance using Streamlit components only"""
@@ -345,21 +417,8 @@ def display_boulder_performance(athlete_data, cols_mapping):
         score = athlete_data.get(col, 0) if col in athlete_data.index else 0
         formatted_score = format_boulder_score(score)
         
-        # Determine status emoji and color
-        if pd.isna(score) or score == 0:
-            status_emoji = "🔴"
-            bg_color = "#e74c3c"
-        else:
-            score_str = str(int(score))
-            if len(score_str) >= 1 and score_str[0] == '1':  # Has top
-                status_emoji = "🟢"
-                bg_color = "#2ecc71"
-            elif len(score_str) >= 2 and score_str[1] == '1':  # Has zone
-                status_emoji = "🟡"
-                bg_color = "#f1c40f"
-            else:
-                status_emoji = "🔴"
-                bg_color = "#e74c3c"
+        # Same top/zone/fail decoding as the static pages
+        bg_color = BOULDER_STATUS_COLORS[get_boulder_status_class(score)]
         
         with boulder_cols[i]:
             st.markdown(f"""
@@ -434,7 +493,7 @@ def get_qualification_status(athlete_data, cols_mapping):
     
     return "", ""
 
-def display_athlete_card(athlete_data, rank, cols_mapping, round_name):
+def display_athlete_card(athlete_data, rank, cols_mapping, round_name, probabilities=None):
     """Display an enhanced athlete card using Streamlit components only"""
     name = athlete_data.get(cols_mapping.get('name', 'Name'), "Unknown")
     score = athlete_data.get(cols_mapping.get('score', 'Total Score'), "N/A")
@@ -489,7 +548,7 @@ def display_athlete_card(athlete_data, rank, cols_mapping, round_name):
                     st.error(qual_status)
         
         with col2:
-            st.metric("Score", score)
+            st.metric("Score", format_score(score, round_name))
         
         # Position information
         current_pos = athlete_data.get(cols_mapping.get('rank', 'Current Rank'), "N/A")
@@ -497,12 +556,16 @@ def display_athlete_card(athlete_data, rank, cols_mapping, round_name):
         
         pos_col1, pos_col2 = st.columns(2)
         with pos_col1:
-            st.info(f"📍 Current: #{current_pos}")
+            st.info(f"📍 Current: #{'N/A' if pd.isna(current_pos) else current_pos}")
         
         if pd.notna(worst_case) and str(worst_case) != "N/A":
             with pos_col2:
                 st.warning(f"⚠️ Worst: #{worst_case}")
         
+        if probabilities is not None:
+            st.caption(f"🎲 Qualify {probabilities['qualify']:.0%} • Top 3 {probabilities['podium']:.0%} "
+                       f"({simulation.DEFAULT_SIMULATIONS:,} simulations)")
+        
         # Add performance data based on round type
         if "Boulder" in round_name:
             display_boulder_performance(athlete_data, cols_mapping)
@@ -512,66 +575,7 @@ def display_athlete_card(athlete_data, rank, cols_mapping, round_name):
         # Close the custom border div
         st.markdown("</div>", unsafe_allow_html=True)
 
-def create_athlete_progression_chart(all_data, athlete_name):
-    """Create a chart showing athlete's progression through competition"""
-    progression_data = []
-    
-    # Define round order
-    round_order = [
-        "Male Boulder Semis", "Male Boulder Final",
-        "Female Boulder Semis", "Female Boulder Final",
-        "Male Lead Semis", "Male Lead Final",
-        "Female Lead Semis", "Female Lead Final"
-    ]
-    
-    for round_name in round_order:
-        if round_name in all_data:
-            df = all_data[round_name]
-            cols_mapping = get_column_mapping(round_name)
-            name_col = cols_mapping.get('name', 'Name')
-            rank_col = cols_mapping.get('rank', 'Current Rank')
-            
-            if name_col in df.columns:
-                athlete_row = df[df[name_col].str.contains(athlete_name, case=False, na=False)]
-                if not athlete_row.empty:
-                    rank = athlete_row.iloc[0].get(rank_col, None)
-                    if pd.notna(rank):
-                        try:
-                            rank_num = int(float(rank))
-                            progression_data.append({
-                                'Round': round_name.replace("Male ", "").replace("Female ", ""),
-                                'Rank': rank_num,
-                                'Full_Round': round_name
-                            })
-                        except:
-                            pass
-    
-    if len(progression_data) > 1:
-        prog_df = pd.DataFrame(progression_data)
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=prog_df['Round'],
-            y=prog_df['Rank'],
-            mode='lines+markers',
-            name=athlete_name,
-            line=dict(width=4, color='#3498db'),
-            marker=dict(size=12, color='#e74c3c', line=dict(width=2, color='white'))
-        ))
-        
-        fig.update_layout(
-            title=f"🏆 {athlete_name}'s Competition Progression",
-            yaxis=dict(autorange='reversed', title="Rank"),
-            xaxis=dict(title="Round"),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        
-        return fig
-    
-    return None
-
-def athlete_detail_view(all_data, athlete_name):
+def athlete_detail_view(all_data, athlete_index, results_table, athlete_name):
     """Show detailed view for a specific athlete across all rounds"""
     st.markdown(f"""
     <div class="round-header">
@@ -581,25 +585,20 @@ def athlete_detail_view(all_data, athlete_name):
     
     athlete_rounds = {}
     
-    # Collect data from all rounds
-    for round_name, df in all_data.items():
-        cols_mapping = get_column_mapping(round_name)
-        name_col = cols_mapping.get('name', 'Name')
-        
-        if name_col in df.columns:
-            athlete_row = df[df[name_col].str.contains(athlete_name, case=False, na=False)]
-            if not athlete_row.empty:
-                athlete_rounds[round_name] = {
-                    'data': athlete_row.iloc[0],
-                    'mapping': cols_mapping
-                }
+    # Collect data from all rounds via the name index
+    athlete_rows = get_athlete_rows(athlete_index, all_data, find_athlete(athlete_index, athlete_name))
+    for round_name, athlete_row in athlete_rows.items():
+        athlete_rounds[round_name] = {
+            'data': athlete_row,
+            'mapping': get_column_mapping(round_name)
+        }
     
     if not athlete_rounds:
         st.warning(f"❌ No data found for athlete: {athlete_name}")
         return
     
     # Show progression chart
-    prog_chart = create_athlete_progression_chart(all_data, athlete_name)
+    prog_chart = create_athlete_progression_chart(results_table, athlete_index, athlete_name)
     if prog_chart:
         st.plotly_chart(prog_chart, use_container_width=True)
     
@@ -621,11 +620,11 @@ def athlete_detail_view(all_data, athlete_name):
             
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("Current Rank", rank)
+                st.metric("Current Rank", "N/A" if pd.isna(rank) else rank)
             with col2:
-                st.metric("Score", score)
+                st.metric("Score", format_score(score, round_name))
             with col3:
-                st.metric("Worst Case", worst_case)
+                st.metric("Worst Case", "N/A" if pd.isna(worst_case) else worst_case)
             
             # Show specific performance data
             if "Boulder" in round_name:
@@ -656,7 +655,7 @@ def athlete_detail_view(all_data, athlete_name):
             
             st.markdown("---")
 
-def display_round_results(df, round_name):
+def display_round_results(df, round_name, probabilities=None):
     """Display results for a specific round with enhanced information"""
     cols_mapping = get_column_mapping(round_name)
     
@@ -674,10 +673,9 @@ def display_round_results(df, round_name):
     
     # Sort by rank if available
     if rank_col and rank_col in df.columns:
-        # Handle mixed data types in rank column
-        df_copy = df.copy()
-        df_copy[rank_col] = pd.to_numeric(df_copy[rank_col], errors='coerce')
-        df_sorted = df_copy.sort_values(by=rank_col, na_position='last')
+        # Handle mixed data types in rank column; assign leaves the shared frame untouched
+        df_sorted = df.assign(**{rank_col: pd.to_numeric(df[rank_col], errors='coerce')})
+        df_sorted = df_sorted.sort_values(by=rank_col, na_position='last')
     else:
         df_sorted = df
     
@@ -687,11 +685,14 @@ def display_round_results(df, round_name):
     # Display athletes in a grid
     cols = st.columns(2)
     
-    for idx, (_, athlete_data) in enumerate(df_sorted.iterrows()):
+    for idx, (row_label, athlete_data) in enumerate(df_sorted.iterrows()):
         rank = athlete_data.get(rank_col, idx + 1) if rank_col else idx + 1
+        athlete_probabilities = None
+        if probabilities is not None and row_label in probabilities.index:
+            athlete_probabilities = probabilities.loc[row_label]
         
         with cols[idx % 2]:
-            display_athlete_card(athlete_data, rank, cols_mapping, round_name)
+            display_athlete_card(athlete_data, rank, cols_mapping, round_name, athlete_probabilities)
 
 def create_competition_overview(all_data):
     """Create an overview of the entire competition"""
@@ -790,9 +791,8 @@ def create_competition_overview(all_data):
                 
                 if name_col in df.columns and rank_col in df.columns:
                     # Get top 3
-                    df_copy = df.copy()
-                    df_copy[rank_col] = pd.to_numeric(df_copy[rank_col], errors='coerce')
-                    top_3 = df_copy.nsmallest(3, rank_col)
+                    ranked = df.assign(**{rank_col: pd.to_numeric(df[rank_col], errors='coerce')})
+                    top_3 = ranked.nsmallest(3, rank_col)
                     
                     st.markdown(f"**{round_name}:**")
                     for _, athlete in top_3.iterrows():
@@ -813,9 +813,8 @@ def create_competition_overview(all_data):
                 
                 if name_col in df.columns and rank_col in df.columns:
                     # Get top 3
-                    df_copy = df.copy()
-                    df_copy[rank_col] = pd.to_numeric(df_copy[rank_col], errors='coerce')
-                    top_3 = df_copy.nsmallest(3, rank_col)
+                    ranked = df.assign(**{rank_col: pd.to_numeric(df[rank_col], errors='coerce')})
+                    top_3 = ranked.nsmallest(3, rank_col)
                     
                     st.markdown(f"**{round_name}:**")
                     for _, athlete in top_3.iterrows():
@@ -824,6 +823,377 @@ def create_competition_overview(all_data):
                         medal = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉"
                         st.write(f"{medal} {name}")
 
+def get_query_param(name):
+    """Read a query parameter with either Streamlit query params API"""
+    query_params = getattr(st, "query_params", None)
+    if query_params is not None:
+        return query_params.get(name)
+    values = st.experimental_get_query_params().get(name)
+    return values[0] if values else None
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer, counting collapsed stacks"""
+    
+    def __init__(self, thread_id, interval=PROFILE_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="stack-sampler", daemon=True)
+    
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+    
+    def collapsed(self):
+        """Stacks in the collapsed format read by flamegraph.pl, speedscope and inferno"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+@st.cache_resource
+def get_profile_lock():
+    """Serialize profiling across sessions; profilers are process-wide"""
+    return threading.Lock()
+
+def profile_view(view_name, view, *view_args):
+    """Run a view under cProfile and a stack sampler, returning the report or None if busy"""
+    profile_lock = get_profile_lock()
+    if not profile_lock.acquire(blocking=False):
+        view(*view_args)
+        return None
+    
+    profiler = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident())
+    sampler.thread.start()
+    started = time.perf_counter()
+    try:
+        profiler.runcall(view, *view_args)
+    finally:
+        wall_ms = (time.perf_counter() - started) * 1000
+        sampler.stopped.set()
+        sampler.thread.join()
+        profile_lock.release()
+    
+    functions_df = pd.DataFrame([
+        {
+            'function': name if filename == '~' else f"{name} ({os.path.basename(filename)}:{line})",
+            'calls': calls,
+            'own_ms': round(own_time * 1000, 2),
+            'cumulative_ms': round(cumulative_time * 1000, 2)
+        }
+        for (filename, line, name), (_, calls, own_time, cumulative_time, _) in pstats.Stats(profiler).stats.items()
+    ])
+    
+    return {
+        'view': view_name,
+        'captured_at': datetime.now(),
+        'wall_ms': wall_ms,
+        'functions': functions_df.nlargest(PROFILE_TOP_FUNCTIONS, 'cumulative_ms'),
+        'collapsed': sampler.collapsed(),
+        'samples': sum(sampler.stacks.values())
+    }
+
+def display_profile_report(report):
+    """Show the slowest functions of a profiled rerun with a flamegraph download"""
+    st.caption(f"{report['view']} • {report['captured_at']:%H:%M:%S} • {report['wall_ms']:.0f} ms • "
+               f"{report['samples']} stack samples")
+    st.dataframe(report['functions'], use_container_width=True, hide_index=True)
+    st.download_button(
+        "⬇️ Download collapsed stacks",
+        report['collapsed'],
+        file_name=f"{report['view'].lower().replace(' ', '-')}-{report['captured_at']:%H%M%S}.collapsed",
+        mime="text/plain",
+        help="Open in speedscope or render with flamegraph.pl"
+    )
+
+def round_results_view(all_data, data_version, selected_round):
+    """Display a round's live results"""
+    df = all_data.get(selected_round, pd.DataFrame())
+    
+    if df.empty:
+        st.error(f"❌ No data available for {selected_round}")
+        return
+    
+    # Round header with live indicator
+    st.markdown(f"""
+    <div class="round-header">
+        🏆 {selected_round}
+        <div style="font-size: 1rem; margin-top: 0.5rem; opacity: 0.9;">
+            🔴 LIVE • {len(df)} Athletes • updated {get_round_store().published_at[selected_round]:%H:%M:%S}
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Display results
+    probabilities = get_round_probabilities(selected_round, dict(data_version).get(selected_round), df)
+    display_round_results(df, selected_round, probabilities)
+
+def athlete_profile_view(all_data, athlete_index, results_table, selected_athlete):
+    """Display the selected athlete's profile, or featured athletes to pick from"""
+    if selected_athlete:
+        follow_index = get_follow_index()
+        session_id = get_session_id()
+        athlete_key = normalize_name(selected_athlete)
+        
+        if athlete_key in follow_index.followed(session_id):
+            if st.button(f"✅ Following {selected_athlete}", help="Stop notifications for this athlete"):
+                follow_index.unfollow(session_id, athlete_key)
+                st.rerun()
+        elif st.button(f"⭐ Follow {selected_athlete}", help="Get a notification whenever their results change"):
+            follow_index.follow(session_id, athlete_key)
+            st.rerun()
+        
+        athlete_detail_view(all_data, athlete_index, results_table, selected_athlete)
+    else:
+        st.info("👆 Please select an athlete from the sidebar to view their complete profile.")
+        
+        # Show random featured athletes
+        st.markdown("### ⭐ Featured Athletes")
+        
+        featured_cols = st.columns(3)
+        featured_count = 0
+        
+        for round_name, df in all_data.items():
+            if featured_count >= 3:
+                break
+                
+            cols_mapping = get_column_mapping(round_name)
+            name_col = cols_mapping.get('name', 'Name')
+            
+            if name_col in df.columns:
+                # Get a random athlete from top 5
+                top_athletes = df.head(5)
+                if not top_athletes.empty:
+                    sample_athlete = top_athletes.sample(1).iloc[0]
+                    name = sample_athlete.get(name_col, "Unknown")
+                    
+                    with featured_cols[featured_count]:
+                        if st.button(f"🎯 View {name}", key=f"featured_{featured_count}"):
+                            st.session_state.selected_athlete = name
+                            st.rerun()
+                    
+                    featured_count += 1
+
+def combined_standings_view(combined_tables, selected_group):
+    """Display combined Boulder & Lead standings for one event and gender"""
+    if selected_group is None:
+        st.info("ℹ️ Combined standings need Boulder and Lead rounds for the same gender.")
+        return
+    
+    table = combined_tables[selected_group]
+    event, gender = selected_group
+    label = f"{event} {gender}" if event else gender
+    
+    st.markdown(f"""
+    <div class="round-header">
+        🧗 Combined Boulder & Lead: {label}
+        <div style="font-size: 1rem; margin-top: 0.5rem; opacity: 0.9;">
+            {len(table)} Athletes ranked in both disciplines
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.caption("Each discipline counts an athlete's final rank, or their semi-final rank if they "
+               "missed the final. The lower product of the two ranks places higher; ties go to the "
+               "better single-discipline rank.")
+    
+    if table.empty:
+        st.warning("⚠️ No athlete has a rank in both disciplines yet.")
+        return
+    st.dataframe(table, hide_index=True, use_container_width=True)
+
+def live_comparison_view(all_data, athlete_index, results_table, selected_athletes):
+    """Compare the selected athletes' ranks across rounds"""
+    if selected_athletes:
+        st.markdown(f"""
+        <div class="round-header">
+            ⚔️ Live Athlete Comparison
+            <div style="font-size: 1rem; margin-top: 0.5rem; opacity: 0.9;">
+                Comparing {len(selected_athletes)} athletes across all rounds
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Select the compared athletes from the materialized results table
+        athlete_ids = [find_athlete(athlete_index, name) for name in selected_athletes]
+        long_df = results_table['long']
+        comparison_df = long_df.loc[
+            long_df['athlete_id'].isin(athlete_ids) & long_df['Rank'].notna(),
+            ['Athlete', 'Round', 'Rank', 'Score']
+        ]
+        
+        ranks = results_table['wide']['Rank'].reindex(index=athlete_ids, columns=list(all_data))
+        detailed_df = ('#' + ranks.astype(str)).where(ranks.notna(), "N/A")
+        detailed_df.insert(0, 'Athlete', selected_athletes)
+        detailed_df = detailed_df.reset_index(drop=True)
+        detailed_df.columns.name = None
+        
+        # Show comparison chart
+        if not comparison_df.empty:
+            fig = px.line(
+                comparison_df, 
+                x='Round', 
+                y='Rank', 
+                color='Athlete',
+                title='🏆 Rank Progression Across Rounds',
+                markers=True,
+                hover_data=['Score']
+            )
+            
+            fig.update_layout(
+                yaxis=dict(autorange='reversed', title="Rank (lower is better)"),
+                xaxis=dict(tickangle=45),
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+            )
+            
+            fig.update_traces(line=dict(width=3), marker=dict(size=8))
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # Show detailed comparison table
+        st.markdown("### 📊 Detailed Comparison")
+        if not detailed_df.empty:
+            st.dataframe(detailed_df, use_container_width=True)
+    
+    else:
+        st.info("👆 Please select athletes from the sidebar to compare their performance.")
+
+def debug_view(all_data, selected_round):
+    """Display a round's raw data alongside ingest and fetch diagnostics"""
+    df = all_data.get(selected_round, pd.DataFrame())
+    
+    st.markdown(f"""
+    <div class="round-header">
+        🔧 Debug Mode: {selected_round}
+    </div>
+    """, unsafe_allow_html=True)
+    
+    if df.empty:
+        st.error(f"❌ No data available for {selected_round}")
+        return
+    
+    # Debug information
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### 📊 DataFrame Info")
+        st.write(f"**Shape:** {df.shape}")
+        st.write(f"**Columns:** {len(df.columns)}")
+        st.write(f"**Non-empty rows:** {len(df[df.iloc[:, 0].notna()])}")
+        
+        st.markdown("#### 📋 Column Profile")
+        # Profiled once per published version, when the store swaps the round in
+        previous_profile, column_profile = get_round_store().column_profiles.get(selected_round, (None, None))
+        if column_profile is not None:
+            st.dataframe(column_profile, hide_index=True, use_container_width=True)
+    
+    with col2:
+        st.markdown("#### 🎯 Column Mapping")
+        cols_mapping = get_column_mapping(selected_round)
+        
+        for key, value in cols_mapping.items():
+            if isinstance(value, list):
+                st.write(f"**{key}:** {', '.join(value)}")
+            else:
+                st.write(f"**{key}:** `{value}`")
+        
+        st.markdown("#### 🔍 Sample Data")
+        st.dataframe(df.head(5))
+    
+    # Columns added, removed or retyped since the round's previous version
+    st.markdown("#### 🧬 Schema Changes")
+    if previous_profile is None:
+        st.write("Only one version of this round has been published so far.")
+    else:
+        schema_diff = diff_column_profiles(previous_profile, column_profile)
+        if schema_diff.empty:
+            st.write("No column changes since the previous version.")
+        else:
+            st.dataframe(schema_diff, hide_index=True, use_container_width=True)
+    
+    # Fetch client health across all rounds
+    st.markdown("#### 🌐 Fetch Client")
+    fetch_status = get_fetch_client().get_status()
+    if fetch_status:
+        url_rounds = {url: round_name for round_name, url in SHEETS_URLS.items()}
+        status_df = pd.DataFrame(fetch_status)
+        status_df.insert(0, 'round', status_df.pop('url').map(url_rounds))
+        st.dataframe(status_df, use_container_width=True)
+    else:
+        st.write("No requests made by this server process yet.")
+    
+    # Adaptive polling schedule (run by the ingest worker in snapshot mode)
+    if not LOCAL_DATA_DIR and not SNAPSHOT_DIR:
+        st.markdown("#### 📅 Poll Schedule")
+        now = time.monotonic()
+        schedule_df = pd.DataFrame([
+            {
+                'round': round_name,
+                'state': entry['state'],
+                'interval_s': entry['interval'],
+                'next_poll_in_s': None if entry['next_poll'] is None else round(max(0, entry['next_poll'] - now)),
+                'unchanged_polls': entry['unchanged'],
+                'polls': entry['polls']
+            }
+            for round_name, entry in get_sheets_source().schedule.items()
+        ])
+        st.dataframe(schedule_df, use_container_width=True)
+    
+    # Memory footprint and schema drift per round
+    st.markdown("#### 💾 Ingest Report")
+    ingest_stats = get_round_store().ingest_stats
+    round_stats = ingest_stats.get(selected_round)
+    if round_stats and round_stats['missing_columns']:
+        st.warning(f"⚠️ Mapped columns missing from the sheet: {', '.join(round_stats['missing_columns'])}")
+    if round_stats and round_stats['unmapped_columns']:
+        st.write(f"**Unmapped columns skipped at parse ({len(round_stats['unmapped_columns'])}):** "
+                 f"{', '.join(round_stats['unmapped_columns'])}")
+    
+    if ingest_stats:
+        memory_df = pd.DataFrame([
+            {
+                'round': round_name,
+                'text_kb': round(stats['bytes_before'] / 1024, 1),
+                'compact_kb': round(stats['bytes_after'] / 1024, 1),
+                'saved': f"{1 - stats['bytes_after'] / max(stats['bytes_before'], 1):.0%}",
+                'kept_as_text': ", ".join(stats['kept_as_text']),
+                'missing': len(stats['missing_columns']),
+                'unmapped': len(stats['unmapped_columns'])
+            }
+            for round_name, stats in ingest_stats.items()
+        ])
+        st.dataframe(memory_df, use_container_width=True)
+    
+    # On-demand profiling of another view's next rerun
+    st.markdown("#### 🔬 Profiler")
+    st.caption(f"Profiles one rerun of the next view you open; add ?{PROFILE_QUERY_PARAM}=1 "
+               "to the URL to profile every rerun.")
+    if st.button("Profile next view rerun"):
+        st.session_state.profile_next_rerun = True
+    if st.session_state.get('profile_next_rerun'):
+        st.info("👈 Switch to the view to profile.")
+    if 'profile_report' in st.session_state:
+        display_profile_report(st.session_state.profile_report)
+    
+    # Raw data one page at a time, so wide sheets aren't sent to the browser whole
+    if st.checkbox("Show Raw Data"):
+        st.markdown("#### 📋 Raw Data")
+        page_col, size_col = st.columns(2)
+        with size_col:
+            page_size = st.selectbox("Rows per page:", [25, 50, 100])
+        page_count = max(1, -(-len(df) // page_size))
+        with page_col:
+            page = st.number_input(f"Page (of {page_count}):", min_value=1, max_value=page_count, value=1)
+        start = (page - 1) * page_size
+        st.dataframe(df.iloc[start:start + page_size], use_container_width=True)
+        st.caption(f"Rows {start + 1}–{min(start + page_size, len(df))} of {len(df)}")
+
 def main():
     """Main application function"""
     setup_page()
@@ -840,12 +1210,21 @@ def main():
     
     # Load all data
     with st.spinner("🔄 Loading competition data..."):
-        all_data = load_all_data()
+        all_data, data_version = load_all_data()
     
     if not all_data:
         st.error("❌ No data could be loaded. Please check your internet connection.")
         return
     
+    athlete_index = get_athlete_index(data_version, all_data)
+    results_table = get_results_table(data_version, all_data, athlete_index)
+    
+    # Changes to followed athletes since this session's last rerun
+    follow_index = get_follow_index()
+    session_id = get_session_id()
+    for event in follow_index.pop_pending(session_id):
+        st.toast(f"{event['round']}: {event['text']}", icon="⭐")
+    
     # Sidebar
     with st.sidebar:
         st.markdown('<div class="sidebar-section">', unsafe_allow_html=True)
@@ -853,49 +1232,66 @@ def main():
         
         app_mode = st.selectbox(
             "Choose view:",
-            ["Competition Overview", "Round Results", "Athlete Profile", "Live Comparison", "Debug Mode"],
+            ["Competition Overview", "Round Results", "Combined Standings", "Athlete Profile",
+             "Live Comparison", "Debug Mode"],
             help="Select how you want to view the competition data"
         )
         
         if app_mode == "Round Results":
             selected_round = st.selectbox("Select Round:", list(all_data.keys()))
         
+        elif app_mode == "Combined Standings":
+            # Only the event/gender groups touched by a new round version are recombined
+            combined_tables = get_combined_standings().update(all_data, data_version)
+            groups = sorted(combined_tables, key=lambda group: (group[0] or "", group[1]))
+            selected_group = st.selectbox(
+                "Select standings:",
+                groups,
+                format_func=lambda group: f"{group[0]} {group[1]}" if group[0] else group[1]
+            )
+        
         elif app_mode == "Live Comparison":
-            # Get all unique athlete names
-            all_athletes = set()
-            for round_name, df in all_data.items():
-                cols_mapping = get_column_mapping(round_name)
-                name_col = cols_mapping.get('name', 'Name')
-                if name_col in df.columns:
-                    athletes = df[name_col].dropna().astype(str)
-                    all_athletes.update(athletes[athletes != ""].tolist())
+            # Athletes are deduplicated across sheets by their normalized name
+            all_athletes = [athlete_index['names'][i] for i in athlete_index['sorted_ids']]
             
             selected_athletes = st.multiselect(
                 "Select athletes to compare:",
-                sorted(list(all_athletes)),
+                all_athletes,
                 max_selections=5,
                 help="Compare up to 5 athletes across all rounds"
             )
         
         elif app_mode == "Athlete Profile":
-            # Get all unique athlete names
-            all_athletes = set()
-            for round_name, df in all_data.items():
-                cols_mapping = get_column_mapping(round_name)
-                name_col = cols_mapping.get('name', 'Name')
-                if name_col in df.columns:
-                    athletes = df[name_col].dropna().astype(str)
-                    all_athletes.update(athletes[athletes != ""].tolist())
+            search_query = st.text_input(
+                "🔍 Search athlete:",
+                help="Ignores accents, case and word order, and tolerates typos"
+            )
+            
+            if search_query:
+                athlete_ids = [athlete_id for athlete_id, _ in search_athletes(athlete_index, search_query)]
+            else:
+                athlete_ids = athlete_index['sorted_ids']
             
             selected_athlete = st.selectbox(
                 "Select athlete:",
-                [""] + sorted(list(all_athletes)),
+                [""] + [athlete_index['names'][i] for i in athlete_ids],
                 help="View detailed performance across all rounds"
             )
         
         elif app_mode == "Debug Mode":
             selected_round = st.selectbox("Select Round for Debug:", list(all_data.keys()))
         
+        # A single profile only needs rerunning when that athlete changes
+        watched = selected_athlete if app_mode == "Athlete Profile" else None
+        follow_index.watch(session_id, normalize_name(watched) if watched else None)
+        
+        followed = follow_index.followed(session_id)
+        if followed:
+            st.markdown("### ⭐ Following")
+            for athlete_key in sorted(followed):
+                athlete_id = athlete_index['key_ids'].get(athlete_key)
+                st.caption(athlete_index['names'][athlete_id] if athlete_id is not None else athlete_key)
+        
         st.markdown('</div>', unsafe_allow_html=True)
         
         # Quick stats
@@ -905,199 +1301,71 @@ def main():
         st.metric("Total Entries", total_entries)
         st.metric("Active Rounds", len(all_data))
         
+        # Live ticker of the latest changes across rounds
+        st.markdown("### 📰 Live Ticker")
+        recent_events = get_round_store().recent_events(8)
+        if recent_events:
+            for event in recent_events:
+                st.caption(f"{event['time']:%H:%M:%S} · {event['round']}")
+                st.write(event['text'])
+        else:
+            st.caption("No changes since the server started.")
+        
         # Show last update time
         st.markdown("### ⏰ Last Updated")
         st.write(datetime.now().strftime("%H:%M:%S"))
-        if st.button("🔄 Refresh Data"):
-            st.cache_data.clear()
-            st.rerun()
+        if SNAPSHOT_DIR:
+            snapshot_source = get_snapshot_source()
+            if snapshot_source.written_at:
+                st.caption(f"🗂️ Snapshots from the ingest worker, written {snapshot_source.written_at:%H:%M:%S}")
+            for round_name, error in {**snapshot_source.worker_errors, **snapshot_source.errors}.items():
+                st.warning(f"⚠️ {round_name}: {error}")
+        elif LOCAL_DATA_DIR:
+            st.caption(f"📂 Watching {LOCAL_DATA_DIR}")
+            # Copied first: the watcher thread adds and removes errors while we render
+            for round_name, error in dict(get_local_source().errors).items():
+                st.warning(f"⚠️ {round_name}: {error}")
+        else:
+            # Copied first: the fetch threads add and remove errors while we render
+            for round_name, error in dict(get_sheets_source().errors).items():
+                st.warning(f"⚠️ {round_name}: {error}")
+            if st.button("🔄 Refresh Data"):
+                get_sheets_source().refresh_all()
+                st.rerun()
         
         st.markdown('</div>', unsafe_allow_html=True)
     
     # Main content based on selected mode
     if app_mode == "Competition Overview":
-        create_competition_overview(all_data)
+        view, view_args = create_competition_overview, (all_data,)
     
     elif app_mode == "Round Results":
-        df = all_data.get(selected_round, pd.DataFrame())
-        
-        if df.empty:
-            st.error(f"❌ No data available for {selected_round}")
-            return
-        
-        # Round header with live indicator
-        st.markdown(f"""
-        <div class="round-header">
-            🏆 {selected_round}
-            <div style="font-size: 1rem; margin-top: 0.5rem; opacity: 0.9;">
-                🔴 LIVE • {len(df)} Athletes
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Display results
-        display_round_results(df, selected_round)
+        view, view_args = round_results_view, (all_data, data_version, selected_round)
+    
+    elif app_mode == "Combined Standings":
+        view, view_args = combined_standings_view, (combined_tables, selected_group)
     
     elif app_mode == "Athlete Profile":
-        if selected_athlete:
-            athlete_detail_view(all_data, selected_athlete)
-        else:
-            st.info("👆 Please select an athlete from the sidebar to view their complete profile.")
-            
-            # Show random featured athletes
-            st.markdown("### ⭐ Featured Athletes")
-            
-            featured_cols = st.columns(3)
-            featured_count = 0
-            
-            for round_name, df in all_data.items():
-                if featured_count >= 3:
-                    break
-                    
-                cols_mapping = get_column_mapping(round_name)
-                name_col = cols_mapping.get('name', 'Name')
-                
-                if name_col in df.columns:
-                    # Get a random athlete from top 5
-                    top_athletes = df.head(5)
-                    if not top_athletes.empty:
-                        sample_athlete = top_athletes.sample(1).iloc[0]
-                        name = sample_athlete.get(name_col, "Unknown")
-                        
-                        with featured_cols[featured_count]:
-                            if st.button(f"🎯 View {name}", key=f"featured_{featured_count}"):
-                                st.session_state.selected_athlete = name
-                                st.rerun()
-                        
-                        featured_count += 1
+        view, view_args = athlete_profile_view, (all_data, athlete_index, results_table, selected_athlete)
     
     elif app_mode == "Live Comparison":
-        if selected_athletes:
-            st.markdown(f"""
-            <div class="round-header">
-                ⚔️ Live Athlete Comparison
-                <div style="font-size: 1rem; margin-top: 0.5rem; opacity: 0.9;">
-                    Comparing {len(selected_athletes)} athletes across all rounds
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Create comparison data
-            comparison_data = []
-            detailed_data = []
-            
-            for athlete_name in selected_athletes:
-                athlete_performance = {'Athlete': athlete_name}
-                
-                for round_name, df in all_data.items():
-                    cols_mapping = get_column_mapping(round_name)
-                    name_col = cols_mapping.get('name', 'Name')
-                    rank_col = cols_mapping.get('rank', 'Current Rank')
-                    score_col = cols_mapping.get('score', 'Total Score')
-                    
-                    if name_col in df.columns:
-                        athlete_row = df[df[name_col].str.contains(athlete_name, case=False, na=False)]
-                        if not athlete_row.empty:
-                            data = athlete_row.iloc[0]
-                            rank = data.get(rank_col, None)
-                            score = data.get(score_col, None)
-                            
-                            if pd.notna(rank):
-                                try:
-                                    rank_num = int(float(rank))
-                                    comparison_data.append({
-                                        'Athlete': athlete_name,
-                                        'Round': round_name,
-                                        'Rank': rank_num,
-                                        'Score': score
-                                    })
-                                    athlete_performance[round_name] = f"#{rank_num}"
-                                except:
-                                    athlete_performance[round_name] = "N/A"
-                            else:
-                                athlete_performance[round_name] = "N/A"
-                        else:
-                            athlete_performance[round_name] = "N/A"
-                
-                detailed_data.append(athlete_performance)
-            
-            # Show comparison chart
-            if comparison_data:
-                comparison_df = pd.DataFrame(comparison_data)
-                
-                fig = px.line(
-                    comparison_df, 
-                    x='Round', 
-                    y='Rank', 
-                    color='Athlete',
-                    title='🏆 Rank Progression Across Rounds',
-                    markers=True,
-                    hover_data=['Score']
-                )
-                
-                fig.update_layout(
-                    yaxis=dict(autorange='reversed', title="Rank (lower is better)"),
-                    xaxis=dict(tickangle=45),
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                )
-                
-                fig.update_traces(line=dict(width=3), marker=dict(size=8))
-                st.plotly_chart(fig, use_container_width=True)
-            
-            # Show detailed comparison table
-            st.markdown("### 📊 Detailed Comparison")
-            if detailed_data:
-                detailed_df = pd.DataFrame(detailed_data)
-                st.dataframe(detailed_df, use_container_width=True)
-        
-        else:
-            st.info("👆 Please select athletes from the sidebar to compare their performance.")
+        view, view_args = live_comparison_view, (all_data, athlete_index, results_table, selected_athletes)
     
     elif app_mode == "Debug Mode":
-        df = all_data.get(selected_round, pd.DataFrame())
-        
-        st.markdown(f"""
-        <div class="round-header">
-            🔧 Debug Mode: {selected_round}
-        </div>
-        """, unsafe_allow_html=True)
-        
-        if df.empty:
-            st.error(f"❌ No data available for {selected_round}")
-            return
-        
-        # Debug information
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("#### 📊 DataFrame Info")
-            st.write(f"**Shape:** {df.shape}")
-            st.write(f"**Columns:** {len(df.columns)}")
-            st.write(f"**Non-empty rows:** {len(df[df.iloc[:, 0].notna()])}")
-            
-            st.markdown("#### 📋 All Columns")
-            for i, col in enumerate(df.columns):
-                non_null = df[col].count()
-                st.write(f"{i+1}. `{col}` ({df[col].dtype}) - {non_null} values")
-        
-        with col2:
-            st.markdown("#### 🎯 Column Mapping")
-            cols_mapping = get_column_mapping(selected_round)
-            
-            for key, value in cols_mapping.items():
-                if isinstance(value, list):
-                    st.write(f"**{key}:** {', '.join(value)}")
-                else:
-                    st.write(f"**{key}:** `{value}`")
-            
-            st.markdown("#### 🔍 Sample Data")
-            st.dataframe(df.head(5))
-        
-        # Show raw data toggle
-        if st.checkbox("Show Full Raw Data"):
-            st.markdown("#### 📋 Complete Dataset")
-            st.dataframe(df)
+        view, view_args = debug_view, (all_data, selected_round)
+    
+    # Without a pending request the view runs with no profiling hooks at all
+    profile_requested = app_mode != "Debug Mode" and st.session_state.pop('profile_next_rerun', False)
+    if profile_requested or get_query_param(PROFILE_QUERY_PARAM):
+        profile_report = profile_view(app_mode, view, *view_args)
+        if profile_report is None:
+            st.info("⏳ Another session is being profiled; this rerun ran unprofiled.")
+        else:
+            st.session_state.profile_report = profile_report
+            with st.expander("🔬 Profile of this rerun", expanded=True):
+                display_profile_report(profile_report)
+    else:
+        view(*view_args)
 
 if __name__ == "__main__":
     main()